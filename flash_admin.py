@@ -2,11 +2,19 @@ from __future__ import annotations
 
 import io
 import json
+import logging
 import os
 import re
 import sqlite3
-import tempfile
+import sys
+import threading
+import time
 import asyncio
+import atexit
+import dataclasses
+import functools
+from collections import deque
+from contextvars import ContextVar
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from pathlib import Path
@@ -15,6 +23,22 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+# 設定JSONの高速化（orjson → ujson → 標準 json の順に使う）
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None  # type: ignore
+
+try:
+    import ujson  # type: ignore
+except Exception:
+    ujson = None  # type: ignore
+
+try:
+    import apsw  # type: ignore
+except Exception:
+    apsw = None  # type: ignore
+
 
 # 固定URL（Cloudflare Tunnel）
 ADMIN_URL_PC = "https://usually-rack-astronomy-flash.trycloudflare.com/admin"
@@ -26,16 +50,199 @@ FLASH_ADMIN_BUILD = "2026-02-17-fix-namespace"
 _SETTINGS_DIR = Path(__file__).resolve().parent / "data"
 _SETTINGS_PATH = _SETTINGS_DIR / "scrim_admin_settings.json"
 
+# scrim_calendar.py のDB（このファイルと同じ階層）
+_BASE_DIR = _SETTINGS_DIR.parent
+_DB_PATH = _BASE_DIR / "scrim.db"
+
 # 時刻入力（24h HH:MM）
 _TIME_RE = re.compile(r"^(?:[01]\d|2[0-3]):[0-5]\d$")
+_TIME_MATCH = _TIME_RE.fullmatch
+
+# HH:MM は固定長なので、ASCII 入力は正規表現を通さず文字比較で判定する
+_FAST_TIME = True
+
+
+def _is_valid_time(s: str) -> bool:
+    if _FAST_TIME and len(s) == 5 and s.isascii():
+        hh, mm = s[:2], s[3:]
+        return s[2] == ":" and hh.isdigit() and mm.isdigit() and hh <= "23" and mm <= "59"
+    return _TIME_MATCH(s) is not None
+
+
+# 数字以外を取り除く（試合番号・基準値の入力用）
+_NON_DIGIT = re.compile(r"[^0-9]")
 
 
 # JST（日付切り替え用）
 _JST = ZoneInfo("Asia/Tokyo")
 
 
+# JST は夏時間の無い固定 UTC+9 なので、日付は整数演算だけで求める
+_JST_OFFSET = 9 * 3600
+
+# (有効期限の epoch 秒, "YYYY-MM-DD")。日付は JST の0時にしか変わらないので、それまで使い回す
+_TODAY_CACHE: tuple[int, str] = (0, "")
+
+
+def _civil_from_days(days: int) -> tuple[int, int, int]:
+    """1970-01-01 からの日数を (年, 月, 日) に変換する（Howard Hinnant の civil_from_days）。"""
+    z = days + 719468
+    era = (z if z >= 0 else z - 146096) // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    d = doy - (153 * mp + 2) // 5 + 1
+    m = mp + 3 if mp < 10 else mp - 9
+    y = yoe + era * 400 + (m <= 2)
+    return y, m, d
+
+
 def _today_jst() -> str:
-    return datetime.now(_JST).strftime("%Y-%m-%d")
+    global _TODAY_CACHE
+    now = int(time.time())
+    if now < _TODAY_CACHE[0]:
+        return _TODAY_CACHE[1]
+    days = (now + _JST_OFFSET) // 86400
+    y, m, d = _civil_from_days(days)
+    s = f"{y:04d}-{m:02d}-{d:02d}"
+    _TODAY_CACHE = ((days + 1) * 86400 - _JST_OFFSET, s)
+    return s
+
+
+# scrim.db（scrim_calendar.py 側のDB）は参照のみなので、接続は1本を使い回す
+# （同一SQL文字列を渡すことで sqlite3 の statement cache がヒットする）
+# apsw が入っている環境では SQLITE_PREPARE_PERSISTENT 付きで prepare する
+_DB_CONN: sqlite3.Connection | apsw.Connection | None = None
+_DB_LOCK = threading.Lock()
+
+# scrim.db の存在確認は毎回ではなく一定間隔でのみ行う（(次回確認の epoch 秒, 存在するか)）
+_DB_EXISTS: tuple[int, bool] = (0, False)
+_DB_EXISTS_TTL = 30
+
+# 本日判定クエリ（date/kind/title/style）を索引だけで完結させるためのカバリングインデックス
+_SQL_TODAY_INDEX = """
+    CREATE INDEX IF NOT EXISTS idx_events_today_scrim
+    ON events(date, kind, title, style)
+"""
+_DB_INDEX_CHECKED = False
+
+# style='登録しない' のイベントは判定対象外
+_STYLE_NOREG = "登録しない"
+
+# ?2 が NULL（選択中スクリム未設定）のときは title 条件を無視する
+# （intern した同一オブジェクトを毎回渡し、statement cache を確実にヒットさせる）
+_SQL_TODAY_SCRIM = sys.intern("""
+    SELECT 1
+    FROM events
+    WHERE date = ?1
+      AND kind = 'スクリム'
+      AND (?2 IS NULL OR title = ?2)
+      AND (style IS NULL OR style <> ?3)
+    LIMIT 1
+""")
+
+
+def _scrim_db_exists() -> bool:
+    global _DB_EXISTS
+    now = int(time.time())
+    if now < _DB_EXISTS[0]:
+        return _DB_EXISTS[1]
+    exists = os.path.exists(str(_DB_PATH))
+    _DB_EXISTS = (now + _DB_EXISTS_TTL, exists)
+    return exists
+
+
+def _ensure_scrim_db_index() -> None:
+    """カバリングインデックスを作成する（成功するまで on_ready のたびに試行。ブロッキング処理）。
+
+    ボタン処理の中（_DB_LOCK 保持中）で書き込みロックを待たないよう、
+    起動時に asyncio.to_thread で呼ぶ。共有接続は読み取り専用のため、ここだけ書き込み可能な一時接続を使う。
+    失敗しても判定自体はインデックス無しで動くので、例外は握りつぶして次回に再試行する。
+    """
+    global _DB_INDEX_CHECKED
+    if _DB_INDEX_CHECKED or not os.path.exists(str(_DB_PATH)):
+        return
+    try:
+        db = sqlite3.connect(str(_DB_PATH), timeout=1.0)
+        try:
+            db.execute(_SQL_TODAY_INDEX)
+            db.commit()
+        finally:
+            db.close()
+    except Exception:
+        return
+    _DB_INDEX_CHECKED = True
+
+
+def _get_scrim_db() -> sqlite3.Connection | apsw.Connection:
+    """scrim.db への共有接続を返す（初回のみ open）。呼び出し側で _DB_LOCK を保持すること。"""
+    global _DB_CONN
+    if _DB_CONN is None:
+        if apsw is not None:
+            db = apsw.Connection(str(_DB_PATH), flags=apsw.SQLITE_OPEN_READONLY)
+        else:
+            # 読み取り専用で開く（ジャーナル作成や書き込みロックの処理を省く）
+            db = sqlite3.connect(
+                f"{_DB_PATH.as_uri()}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+                isolation_level=None,
+                cached_statements=128,
+            )
+        db.execute("PRAGMA query_only = ON")
+        db.execute("PRAGMA cache_size = -2000")
+        db.execute("PRAGMA mmap_size = 67108864")
+        _DB_CONN = db
+    return _DB_CONN
+
+
+def _db_fetch_one(db: sqlite3.Connection | apsw.Connection, sql: str, params: tuple):
+    """1行だけ取得する。apsw の場合は何度も使う文として prepare させる。"""
+    if apsw is not None and isinstance(db, apsw.Connection):
+        cur = db.cursor().execute(sql, params, prepare_flags=apsw.SQLITE_PREPARE_PERSISTENT)
+        return next(cur, None)
+    return db.execute(sql, params).fetchone()
+
+
+def _close_scrim_db() -> None:
+    global _DB_CONN
+    with _DB_LOCK:
+        db, _DB_CONN = _DB_CONN, None
+    if db is not None:
+        try:
+            db.close()
+        except Exception:
+            pass
+
+
+def _today_scrim_title(guild_id: int | None) -> str | None:
+    """本日判定の対象スクリム名（selected_scrim 未設定 / default なら None）。"""
+    try:
+        if guild_id is not None:
+            s = _get_selected_scrim(guild_id)
+            if type(s) is str:
+                s2 = s.strip()
+                if s2 and s2 != "default":
+                    return s2
+    except Exception:
+        pass
+    return None
+
+
+def _probe_today_scrim(today: str, selected_title: str | None) -> bool:
+    """scrim.db を引いて判定する（ブロッキング処理。スレッドからも呼べる）。"""
+    if not _scrim_db_exists():
+        return False
+
+    try:
+        with _DB_LOCK:
+            db = _get_scrim_db()
+            return _db_fetch_one(db, _SQL_TODAY_SCRIM, (today, selected_title, _STYLE_NOREG)) is not None
+    except Exception:
+        # 接続が壊れている可能性があるので、次回は開き直す
+        _close_scrim_db()
+        return False
 
 
 def _has_today_scrim_excluding_tournament(guild_id: int | None = None) -> bool:
@@ -48,71 +255,62 @@ def _has_today_scrim_excluding_tournament(guild_id: int | None = None) -> bool:
       - selected_scrim が未設定/ default の場合は「本日のスクリムが1件でもあれば True」
     - 何らかの理由でDB参照に失敗した場合は False（安全側）とする
     """
-    today = _today_jst()
+    return _probe_today_scrim(_today_jst(), _today_scrim_title(guild_id))
 
-    # 対象スクリム名（未設定なら None 扱い）
-    selected_title: str | None = None
-    try:
-        if guild_id is not None:
-            s = _get_selected_scrim(int(guild_id))
-            if isinstance(s, str) and s.strip() and s.strip() != "default":
-                selected_title = s.strip()
-    except Exception:
-        selected_title = None
 
-    base_dir = Path(__file__).resolve().parent
-    db_path = base_dir / "scrim.db"
-    if not db_path.exists():
-        return False
+# guild_id -> (YYYY-MM-DD, 判定時刻(monotonic), 結果)
+_TODAY_SCRIM_CACHE: dict[int | None, tuple[str, float, bool]] = {}
+_TODAY_SCRIM_TTL = 60.0
 
-    try:
-        db = sqlite3.connect(str(db_path))
-        try:
-            if selected_title:
-                cur = db.execute(
-                    """
-                    SELECT 1
-                    FROM events
-                    WHERE date = ?
-                      AND kind = 'スクリム'
-                      AND title = ?
-                      AND (style IS NULL OR style <> ?)
-                    LIMIT 1
-                    """,
-                    (today, selected_title, "登録しない"),
-                )
-            else:
-                cur = db.execute(
-                    """
-                    SELECT 1
-                    FROM events
-                    WHERE date = ?
-                      AND kind = 'スクリム'
-                      AND (style IS NULL OR style <> ?)
-                    LIMIT 1
-                    """,
-                    (today, "登録しない"),
-                )
-            return cur.fetchone() is not None
-        finally:
-            try:
-                db.close()
-            except Exception:
-                pass
-    except Exception:
-        return False
 
+async def has_today_scrim_async(guild_id: int | None = None) -> bool:
+    """_has_today_scrim_excluding_tournament の非同期版。
 
+    - DB参照はスレッドで実行し、イベントループを止めない
+    - 結果は (guild_id, 当日) ごとに一定時間キャッシュする
+    """
+    today = _today_jst()
+    now = time.monotonic()
+    ent = _TODAY_SCRIM_CACHE.get(guild_id)
+    if ent is not None and ent[0] == today and now - ent[1] < _TODAY_SCRIM_TTL:
+        return ent[2]
 
-def _next_match_no(guild_id: int) -> str:
-    """自動モード用：マッチ番号を日次で 01,02,... と自動インクリメントして返す。
+    res = await asyncio.to_thread(_probe_today_scrim, today, _today_scrim_title(guild_id))
+    _TODAY_SCRIM_CACHE[guild_id] = (today, now, res)
+    return res
 
-    - 保存先は scrim_admin_settings.json（選択中スクリム配下）に保持
-    - 日付が変わったら 01 にリセット
-    - スクリム名ごとに独立したカウンタ
+
+def invalidate_today_scrim_cache(guild_id: int | None = None) -> None:
+    """本日判定のキャッシュを破棄する（スクリム登録・対象スクリム変更時に呼ぶ）。
+
+    guild_id を省略した場合は全ギルド分を破棄する。
     """
-    data = _load_settings()
+    if guild_id is None:
+        _TODAY_SCRIM_CACHE.clear()
+    else:
+        _TODAY_SCRIM_CACHE.pop(guild_id, None)
+
+
+# マッチ番号 "01"〜"127" の表（大半はこの範囲に収まる）
+_MATCH_NO_TABLE = [f"{i:02d}" for i in range(128)]
+
+
+def _format_match_no(n: int) -> str:
+    return _MATCH_NO_TABLE[n] if 0 <= n < 128 else f"{n:02d}"
+
+
+def _get_day_block(data: dict, guild_id: int, today: str | None = None) -> dict:
+    """選択中スクリムの日別カウンタ（match_counter[YYYY-MM-DD]）を返す（無ければ作成）。"""
+    today = today or _today_jst()
     gid = str(guild_id)
+
+    # 整形済み（_ensure_schema 済み）なら、そのまま辿れる
+    try:
+        g = data[gid]
+        return g["scrims"][g["selected_scrim"]]["match_counter"][today]
+    except (KeyError, TypeError):
+        pass
+
     g = data.setdefault(gid, {})
 
     # 新形式へ整形
@@ -121,23 +319,33 @@ def _next_match_no(guild_id: int) -> str:
     if not isinstance(sel, str) or not sel.strip():
         sel = "default"
         g["selected_scrim"] = sel
-    block = scrims.setdefault(sel, {})
 
     # 日別カウンタ（YYYY-MM-DD -> {"next": int}）
-    counter = block.setdefault("match_counter", {})
-    today = _today_jst()
-    day = counter.setdefault(today, {})
+    return scrims.setdefault(sel, {}).setdefault("match_counter", {}).setdefault(today, {})
+
+
+def _next_match_no(guild_id: int) -> str:
+    """自動モード用：マッチ番号を日次で 01,02,... と自動インクリメントして返す。
+
+    - 保存先は scrim_admin_settings.json（選択中スクリム配下）に保持
+    - 日付が変わったら 01 にリセット
+    - スクリム名ごとに独立したカウンタ
+    """
+    return _reserve_match_nos(guild_id, 1)[0]
 
+
+def _reserve_match_nos(guild_id: int, n: int) -> list[str]:
+    """連番のマッチ番号を n 件まとめて確保する（カウンタ更新・書き込み予約は1回）。"""
+    day = _get_day_block(_load_settings_for_update(), guild_id)
     try:
-        n_int = int(day.get("next", 1))
+        start = max(1, int(day.get("next", 1)))
     except Exception:
-        n_int = 1
-    if n_int < 1:
-        n_int = 1
+        start = 1
 
-    day["next"] = n_int + 1
-    _save_settings(data)
-    return f"{n_int:02d}"
+    n = max(1, int(n))
+    day["next"] = start + n
+    _mark_dirty()
+    return [_format_match_no(i) for i in range(start, start + n)]
 
 
 def _set_manual_match_counter(guild_id: int, value: int) -> None:
@@ -145,51 +353,30 @@ def _set_manual_match_counter(guild_id: int, value: int) -> None:
 
     例：手動で「03」を送った場合、同日の自動採番は次回「04」になる。
     """
-    data = _load_settings()
-    gid = str(guild_id)
-    g = data.setdefault(gid, {})
-
-    scrims = g.setdefault("scrims", {"default": {}})
-    sel = g.get("selected_scrim")
-    if not isinstance(sel, str) or not sel.strip():
-        sel = "default"
-        g["selected_scrim"] = sel
-    block = scrims.setdefault(sel, {})
+    _get_day_block(_load_settings_for_update(), guild_id)["next"] = int(value) + 1
+    _mark_dirty()
 
-    counter = block.setdefault("match_counter", {})
-    today = _today_jst()
-    day = counter.setdefault(today, {})
-    day["next"] = int(value) + 1
-    _save_settings(data)
 
 def _set_next_match_no(guild_id: int, value: int) -> None:
     """次回の自動採番（= 次Match開始番号）を直接設定する。
 
     例：次Matchを 05 から始めたい → value=5 を渡す（同日の次回自動採番が 05 になる）。
     """
-    data = _load_settings()
-    gid = str(guild_id)
-    g = data.setdefault(gid, {})
+    _get_day_block(_load_settings_for_update(), guild_id)["next"] = int(value)
+    _mark_dirty()
 
-    scrims = g.setdefault("scrims", {"default": {}})
-    sel = g.get("selected_scrim")
-    if not isinstance(sel, str) or not sel.strip():
-        sel = "default"
-        g["selected_scrim"] = sel
-    block = scrims.setdefault(sel, {})
 
-    counter = block.setdefault("match_counter", {})
-    today = _today_jst()
-    day = counter.setdefault(today, {})
-    day["next"] = int(value)
-    _save_settings(data)
 def _default_individual_thread_name(guild_id: int) -> str:
     """個別スレッドのデフォルト名。
     selected_scrim + Match #NN（NN は自動採番）を使う。
     """
+    return _default_individual_thread_names(guild_id, 1)[0]
+
+
+def _default_individual_thread_names(guild_id: int, n: int) -> list[str]:
+    """個別スレッドのデフォルト名を n 件分まとめて返す（連続でスレッドを作る場合用）。"""
     scrim = _get_selected_scrim(guild_id)
-    no = _next_match_no(guild_id)
-    return f"{scrim} Match #{no}"
+    return [f"{scrim} Match #{no}" for no in _reserve_match_nos(guild_id, n)]
 
 
 
@@ -221,47 +408,402 @@ _FLASH_KEYS = (
     "end_message_text",
     "replay_submit_channel_id",
 )
+_FLASH_KEY_SET = frozenset(_FLASH_KEYS)
+# 旧キー -> flash_* キー
+_FLASH_KEY_MAP = {k: f"{_FLASH_KEY_PREFIX}{k}" for k in _FLASH_KEYS}
+_AUTOSEND_TIME_KEY = _FLASH_KEY_MAP["autosend_time"]
 
 def _flash_key(key: str) -> str:
-    return f"{_FLASH_KEY_PREFIX}{key}"
+    return _FLASH_KEY_MAP.get(key) or f"{_FLASH_KEY_PREFIX}{key}"
 
 
 
+# interaction.id -> 判定結果。interaction_check とコールバックで同じ interaction を
+# 続けて判定するときに、ロールからの権限計算をやり直さない
+_ADMIN_CACHE: dict[int, bool] = {}
+_ADMIN_CACHE_MAX = 256
+
+
 def _is_admin(interaction: discord.Interaction) -> bool:
     """ボタン/モーダル側でも権限制御する（コマンド以外から叩ける可能性があるため）。"""
     if interaction.guild is None or interaction.user is None:
         return False
-    perms = interaction.user.guild_permissions
-    return bool(perms.administrator)
+    iid = interaction.id
+    hit = _ADMIN_CACHE.get(iid)
+    if hit is not None:
+        return hit
+
+    # interaction.permissions は Discord 側で計算済みの値（ペイロードの整数）なので、
+    # Member.guild_permissions のようにロールを畳み込まない
+    perms = getattr(interaction, "permissions", None)
+    if perms is None:
+        perms = interaction.user.guild_permissions
+    ok = bool(perms.administrator)
+
+    if len(_ADMIN_CACHE) >= _ADMIN_CACHE_MAX:
+        _ADMIN_CACHE.pop(next(iter(_ADMIN_CACHE)))
+    _ADMIN_CACHE[iid] = ok
+    return ok
+
+
+# 設定はメモリ上に保持し、ファイルが外部（scrim_admin 等）で更新された場合のみ読み直す。
+# 各セッターは _load_settings_for_update() の dict を直接書き換えて _mark_dirty() を呼ぶ。
+# 書き込みは遅延させ、短時間の連続更新は1回にまとめる。
+_SETTINGS_CACHE: dict | None = None
+_SETTINGS_STAMP: tuple[int, int] | None = None  # (st_mtime_ns, st_size)
+# キャッシュの元になったファイル内容（ローカル変更を取り出す3-wayマージの基準）
+_SETTINGS_BASE: bytes | None = None
+# _SETTINGS_STAMP / _SETTINGS_BASE の更新と「確認→置換」を直列化する
+_SYNC_LOCK = threading.Lock()
+_SETTINGS_DIRTY = False
+_SETTINGS_VERSION = 0  # メモリ上の設定が変わるたびに増える（派生キャッシュの無効化用）
+_FLUSH_HANDLE: asyncio.TimerHandle | threading.Timer | None = None
+_FLUSH_DELAY = 0.25
+# 読み取り専用の getter からの外部更新の確認（os.stat）は最短でもこの間隔に1回だけ行う。
+# 1回の操作で getter が何度も呼ばれても stat は1回で済む（セッターは毎回確認する）
+_STAMP_CHECK_INTERVAL = 1.0
+_STAMP_CHECKED_AT = 0.0
+
+
+def _settings_stamp() -> tuple[int, int] | None:
+    """更新検知用に (mtime_ns, size) を返す。mtime の分解能が粗い環境でもサイズ差で検知できる。"""
+    try:
+        st = os.stat(_SETTINGS_PATH)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
 
 
-def _load_settings() -> dict:
+def _parse_settings(raw: bytes | None) -> dict:
+    if not raw:
+        return {}
     try:
-        with _SETTINGS_PATH.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        if orjson is not None:
+            data = orjson.loads(raw)
+        elif ujson is not None:
+            data = ujson.loads(raw)
+        else:
+            data = json.loads(raw)
         return data if isinstance(data, dict) else {}
-    except FileNotFoundError:
-        return {}
     except Exception:
         # 壊れていても落とさない（まずは空として扱う）
         return {}
 
 
-def _save_settings(data: dict) -> None:
+def _read_settings_raw() -> bytes | None:
+    try:
+        return _SETTINGS_PATH.read_bytes()
+    except OSError:
+        return None
+
+
+def _read_settings_file() -> dict:
+    return _parse_settings(_read_settings_raw())
+
+
+_MISSING = object()
+
+
+def _merge_settings(base, ours, theirs):
+    """3-wayマージ：base から ours で変えたキーだけを theirs（現在のファイル内容）へ載せ直す。
+
+    dict は再帰的に辿るので、同じギルドでも別のキーの変更は両方残る。
+    同じキーを両方が変えていた場合は ours（このプロセスの変更）を優先する。
+    """
+    if ours == base:
+        return theirs
+    if not (isinstance(base, dict) and isinstance(ours, dict) and isinstance(theirs, dict)):
+        return ours
+    out = {}
+    for k in (*theirs, *(k for k in ours if k not in theirs)):
+        v = _merge_settings(base.get(k, _MISSING), ours.get(k, _MISSING), theirs.get(k, _MISSING))
+        if v is not _MISSING:
+            out[k] = v
+    return out
+
+
+def _dump_settings(data: dict, *, pretty: bool = False) -> bytes:
+    """設定をバイト列にする。
+
+    通常はボットしか書き換えないため、インデント無しのコンパクト形式で保存する。
+    人が読むための整形版は pretty=True（/flash_settings_dump）で別ファイルに出力する。
+    """
+    if orjson is not None:
+        opt = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            opt |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=opt)
+    if ujson is not None:
+        return ujson.dumps(
+            data, ensure_ascii=False, indent=2 if pretty else 0, escape_forward_slashes=False
+        ).encode("utf-8")
+    if pretty:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+_SETTINGS_PRETTY_PATH = _SETTINGS_DIR / f"{_SETTINGS_PATH.stem}.pretty.json"
+
+
+def _write_settings_pretty() -> Path:
+    """現在の設定を整形済み JSON として別ファイルに書き出す（確認用。読み込みには使わない）。"""
     _SETTINGS_DIR.mkdir(parents=True, exist_ok=True)
-    tmp_fd, tmp_path = tempfile.mkstemp(prefix="scrim_admin_", suffix=".json", dir=str(_SETTINGS_DIR))
+    _SETTINGS_PRETTY_PATH.write_bytes(_dump_settings(_load_settings(), pretty=True))
+    return _SETTINGS_PRETTY_PATH
+
+
+def _write_settings_bytes(buf: bytes) -> None:
+    """設定ファイルを置き換える（書き込みスレッドからのみ呼ぶ）。
+
+    scrim_admin も同じファイルを読み、壊れていると空設定として扱うため、
+    途中状態が見えないよう一時ファイル + os.replace は維持する。
+    一時ファイル名は書き込みスレッドごとに固定し、mkstemp の名前生成と後片付けを省く。
+    """
+    tmp_path = _SETTINGS_DIR / f".{_SETTINGS_PATH.stem}.{os.getpid()}.{threading.get_ident()}.tmp"
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    try:
+        tmp_fd = os.open(tmp_path, flags, 0o644)
+    except FileNotFoundError:
+        _SETTINGS_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_fd = os.open(tmp_path, flags, 0o644)
     try:
-        with os.fdopen(tmp_fd, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # 全体を1回の writev で書き出し、データ部分だけ同期する
+        try:
+            view = memoryview(buf)
+            while view:
+                n = os.writev(tmp_fd, [view]) if hasattr(os, "writev") else os.write(tmp_fd, view)
+                view = view[n:]
+            if hasattr(os, "fdatasync"):
+                os.fdatasync(tmp_fd)
+            else:
+                os.fsync(tmp_fd)
+            # 設定ファイルでページキャッシュを占有しない
+            if hasattr(os, "posix_fadvise"):
+                try:
+                    os.posix_fadvise(tmp_fd, 0, 0, os.POSIX_FADV_DONTNEED)
+                except OSError:
+                    pass
+        finally:
+            os.close(tmp_fd)
         os.replace(tmp_path, _SETTINGS_PATH)
-    finally:
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _commit_settings_bytes(buf: bytes) -> None:
+    """書き込みスレッド用：置換の直前にファイルが外部で更新されていないか確認してから書く。
+
+    更新されていた場合は、このプロセスで変えたキーだけを現在のファイル内容へマージして書く。
+    キャッシュには外部の変更がまだ入っていないため、その場合は基準とスタンプを進めない
+    （次回の確認で読み直し / マージの対象になる）。
+    """
+    global _SETTINGS_STAMP, _SETTINGS_BASE
+    with _SYNC_LOCK:
+        if _settings_stamp() != _SETTINGS_STAMP:
+            merged = _merge_settings(
+                _parse_settings(_SETTINGS_BASE), _parse_settings(buf), _read_settings_file()
+            )
+            _write_settings_bytes(_dump_settings(merged))
+            return
+        _write_settings_bytes(buf)
+        _SETTINGS_STAMP = _settings_stamp()
+        _SETTINGS_BASE = buf
+
+
+# 実際のファイル書き込みは専用スレッド1本で行う。
+# 書き込み待ちは「最新の1件」だけを保持し、連続した保存要求は最後の内容で1回だけ書く。
+_PENDING: bytes | None = None
+_PENDING_LOCK = threading.Lock()
+_PENDING_EVT = threading.Event()
+_WRITE_BUSY = False  # 書き込み待ち / 書き込み中（この間はファイルを読み直さない）
+_WRITE_IDLE_EVT = threading.Event()
+_WRITE_IDLE_EVT.set()
+_WRITER: threading.Thread | None = None
+# 書き込みに失敗したとき（容量不足・権限など）の再試行間隔
+_WRITE_RETRY_DELAY = 5.0
+
+
+def _writer_loop() -> None:
+    global _PENDING, _WRITE_BUSY
+    while True:
+        _PENDING_EVT.wait()
+        with _PENDING_LOCK:
+            buf, _PENDING = _PENDING, None
+            _PENDING_EVT.clear()
+        if buf is not None:
+            try:
+                _commit_settings_bytes(buf)
+            except Exception:
+                logging.getLogger("scrim_keydrop_bot").exception(
+                    "flash_admin: settings write failed; retrying in %.0fs", _WRITE_RETRY_DELAY
+                )
+                # 失敗した内容を書き込み待ちに戻す（その間に新しい内容が来ていればそちらを書く）。
+                # 書き込み中扱いのままにして、未保存の変更をファイルの内容で上書きしない
+                with _PENDING_LOCK:
+                    if _PENDING is None:
+                        _PENDING = buf
+                time.sleep(_WRITE_RETRY_DELAY)
+                _PENDING_EVT.set()
+                continue
+        with _PENDING_LOCK:
+            if _PENDING is None:
+                _WRITE_BUSY = False
+                _WRITE_IDLE_EVT.set()
+
+
+def _write_settings_file(data: dict) -> None:
+    """設定を直列化して書き込みスレッドへ渡す（ファイルI/Oは待たない）。"""
+    global _PENDING, _WRITE_BUSY, _WRITER
+    buf = _dump_settings(data)
+    with _PENDING_LOCK:
+        _PENDING = buf
+        _WRITE_BUSY = True
+        _WRITE_IDLE_EVT.clear()
+        _PENDING_EVT.set()
+        if _WRITER is None or not _WRITER.is_alive():
+            _WRITER = threading.Thread(target=_writer_loop, name="flash_admin_settings_writer", daemon=True)
+            _WRITER.start()
+
+
+# 設定ファイルの整形済みマーカー（ギルドIDと衝突しないキー）
+_SCHEMA_KEY = "__schema__"
+_SCHEMA_VERSION = 3
+
+
+def _ensure_schema(data: dict) -> None:
+    """新形式（scrims / selected_scrim）のギルドについて構造を一度だけ整え、マーカーを付ける。
+
+    不正な自動案内時刻（flash_autosend_time）もここで取り除く。
+
+    旧形式（scrims が無い）のギルドは _get_guild_container 側のマイグレーションに任せる。
+    以降に追加されたギルドは、各アクセス経路の遅い経路（setdefault）で整形される。
+    """
+    for gid, g in data.items():
+        if gid == _SCHEMA_KEY or not isinstance(g, dict) or "scrims" not in g:
+            continue
+        scrims = g.get("scrims")
+        if not isinstance(scrims, dict):
+            scrims = g["scrims"] = {"default": {}}
+        sel = g.get("selected_scrim")
+        if not isinstance(sel, str) or not sel.strip():
+            sel = g["selected_scrim"] = "default"
+        if not isinstance(scrims.get(sel), dict):
+            scrims[sel] = {}
+        # 時刻はセッター側で検証済みの値だけを保持する（ゲッターでは再検証しない）
+        for block in scrims.values():
+            if isinstance(block, dict):
+                t = block.get(_AUTOSEND_TIME_KEY)
+                if t is not None and not (isinstance(t, str) and _is_valid_time(t)):
+                    del block[_AUTOSEND_TIME_KEY]
+    data[_SCHEMA_KEY] = _SCHEMA_VERSION
+
+
+def _load_settings() -> dict:
+    global _SETTINGS_CACHE, _SETTINGS_STAMP, _SETTINGS_BASE, _SETTINGS_VERSION, _STAMP_CHECKED_AT
+    # 未書き込みの変更がある間はメモリ側を正とする（外部の変更は書き込み時にマージする）
+    if _SETTINGS_CACHE is not None and (_SETTINGS_DIRTY or _WRITE_BUSY):
+        return _SETTINGS_CACHE
+
+    now = time.monotonic()
+    if _SETTINGS_CACHE is not None and now - _STAMP_CHECKED_AT < _STAMP_CHECK_INTERVAL:
+        return _SETTINGS_CACHE
+    _STAMP_CHECKED_AT = now
+
+    stamp = _settings_stamp()
+    if _SETTINGS_CACHE is not None and stamp == _SETTINGS_STAMP:
+        return _SETTINGS_CACHE
+
+    with _SYNC_LOCK:
+        stamp = _settings_stamp()
+        raw = _read_settings_raw()
+        _SETTINGS_CACHE = _parse_settings(raw)
+        _SETTINGS_STAMP = stamp
+        _SETTINGS_BASE = raw
+    _SETTINGS_VERSION += 1
+    _SELECTED_SCRIM_CACHE.clear()
+    if _SETTINGS_CACHE and _SETTINGS_CACHE.get(_SCHEMA_KEY) != _SCHEMA_VERSION:
+        _ensure_schema(_SETTINGS_CACHE)
+        _mark_dirty()
+    return _SETTINGS_CACHE
+
+
+def _load_settings_for_update() -> dict:
+    """セッター用：確認間隔を無視してファイルの更新を確認してから設定を返す。
+
+    間隔内の古いキャッシュを書き換えて保存すると、scrim_admin 側の変更を上書きしてしまうため。
+    """
+    global _STAMP_CHECKED_AT
+    _STAMP_CHECKED_AT = 0.0
+    return _load_settings()
+
+
+def _save_settings(data: dict) -> None:
+    global _SETTINGS_CACHE, _SETTINGS_DIRTY, _SETTINGS_VERSION
+    _cancel_flush()
+    _SETTINGS_CACHE = data
+    _SETTINGS_DIRTY = False
+    _SETTINGS_VERSION += 1
+    _write_settings_file(data)
+
+
+def _cancel_flush() -> None:
+    global _FLUSH_HANDLE
+    h, _FLUSH_HANDLE = _FLUSH_HANDLE, None
+    if h is not None:
         try:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+            h.cancel()
         except Exception:
             pass
 
 
+def _mark_dirty() -> None:
+    """キャッシュ中の設定を変更済みとしてマークし、遅延書き込みを予約する。"""
+    global _SETTINGS_DIRTY, _SETTINGS_VERSION, _FLUSH_HANDLE
+    _SETTINGS_DIRTY = True
+    _SETTINGS_VERSION += 1
+    if _FLUSH_HANDLE is not None:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+        _FLUSH_HANDLE = loop.call_later(_FLUSH_DELAY, _flush)
+    except RuntimeError:
+        # イベントループ外（起動処理など）から呼ばれた場合
+        t = threading.Timer(_FLUSH_DELAY, _flush)
+        t.daemon = True
+        t.start()
+        _FLUSH_HANDLE = t
+
+
+def _flush() -> None:
+    """遅延中の設定変更をファイルへ書き出す。"""
+    global _SETTINGS_DIRTY
+    _cancel_flush()
+    if not _SETTINGS_DIRTY or _SETTINGS_CACHE is None:
+        return
+    _SETTINGS_DIRTY = False
+    try:
+        _write_settings_file(_SETTINGS_CACHE)
+    except Exception:
+        # 直列化の失敗時は次回に持ち越す（ファイル書き込みの失敗は書き込みスレッドが再試行する）
+        _SETTINGS_DIRTY = True
+
+
+def _flush_and_wait(timeout: float = 5.0) -> None:
+    """遅延中の変更を書き出し、書き込みスレッドの完了を待つ（終了時用）。"""
+    _flush()
+    _WRITE_IDLE_EVT.wait(timeout)
+
+
+atexit.register(_flush_and_wait)
+
+
+
+_FLASH_MIGRATED = False
+
 
 def _flash_migrate_namespace_once() -> None:
     """flash_admin の設定キー衝突を解消するための一回限りのマイグレーション。
@@ -272,8 +814,11 @@ def _flash_migrate_namespace_once() -> None:
     - 既存環境を壊さないため、初回だけ旧キー（未プレフィックス）を flash_* に COPY する。
       （scrim_admin 側の旧キーは残す）
     """
+    global _FLASH_MIGRATED
+    if _FLASH_MIGRATED:
+        return
     try:
-        data = _load_settings()
+        data = _load_settings_for_update()
         changed = False
 
         for gid, g in list(data.items()):
@@ -288,20 +833,27 @@ def _flash_migrate_namespace_once() -> None:
             if not isinstance(scrims, dict):
                 continue
 
-            for sname, block in list(scrims.items()):
+            for block in scrims.values():
                 if not isinstance(block, dict):
                     continue
-                for k in _FLASH_KEYS:
-                    fk = _flash_key(k)
-                    if fk not in block and k in block:
-                        block[fk] = block.get(k)
-                        changed = True
+                copied = {
+                    _FLASH_KEY_MAP[k]: block[k]
+                    for k in _FLASH_KEY_SET.intersection(block)
+                    if _FLASH_KEY_MAP[k] not in block
+                }
+                # 旧キーの時刻は検証してからコピーする（不正値は持ち込まない）
+                t = copied.get(_AUTOSEND_TIME_KEY)
+                if t is not None and not (isinstance(t, str) and _is_valid_time(t)):
+                    del copied[_AUTOSEND_TIME_KEY]
+                if copied:
+                    block.update(copied)
 
             g["flash_namespace_migrated"] = True
             changed = True
 
         if changed:
-            _save_settings(data)
+            _mark_dirty()
+        _FLASH_MIGRATED = True
     except Exception:
         # 失敗してもBotを落とさない
         pass
@@ -316,6 +868,8 @@ def _get_guild_container(guild_id: int) -> dict:
         g = {}
         data[gid] = g
 
+    changed = False
+
     # 旧形式（ギルド直下に設定値が並んでいる）→ 新形式へマイグレーション
     if "scrims" not in g:
         old_keys = (
@@ -334,19 +888,20 @@ def _get_guild_container(guild_id: int) -> dict:
 
         g["selected_scrim"] = g.get("selected_scrim") or "default"
         g["scrims"] = {"default": default_block}
-        _save_settings(data)
+        changed = True
 
     # 新形式の整形
     if not isinstance(g.get("scrims"), dict):
         g["scrims"] = {"default": {}}
         g["selected_scrim"] = g.get("selected_scrim") or "default"
-        _save_settings(data)
+        changed = True
 
     if not isinstance(g.get("selected_scrim"), str) or not g["selected_scrim"].strip():
         g["selected_scrim"] = "default"
-        _save_settings(data)
-
+        changed = True
 
+    if changed:
+        _mark_dirty()
     return g
 
 # ----------------------------
@@ -361,14 +916,14 @@ def _get_guild_value(guild_id: int, key: str, default=None):
 
 
 def _set_guild_value(guild_id: int, key: str, value) -> None:
-    data = _load_settings()
+    data = _load_settings_for_update()
     gid = str(guild_id)
     g = data.get(gid)
     if not isinstance(g, dict):
         g = {}
         data[gid] = g
     g[key] = value
-    _save_settings(data)
+    _mark_dirty()
 
 
 def _get_flash_auto_start(guild_id: int) -> bool:
@@ -393,6 +948,7 @@ def _is_flash_auto_started_today(guild_id: int) -> bool:
 
 
 def _mark_flash_auto_started_today(guild_id: int) -> None:
+    _load_settings_for_update()  # 既存の記録を最新のファイル内容から取る
     d = _get_guild_value(guild_id, "flash_auto_started", {})
     if not isinstance(d, dict):
         d = {}
@@ -411,12 +967,21 @@ def _set_flash_thresholds(guild_id: int, thresholds: dict) -> None:
 
 
 
+# guild_id -> 選択中スクリム名。_set_selected_scrim と設定ファイルの再読込時に破棄する
+_SELECTED_SCRIM_CACHE: dict[int, str] = {}
+
+
 def _get_selected_scrim(guild_id: int) -> str:
+    # 外部（scrim_admin 等）での更新を拾うため、ファイル更新チェックだけは毎回行う
+    _load_settings()
+    v = _SELECTED_SCRIM_CACHE.get(guild_id)
+    if v is not None:
+        return v
     g = _get_guild_container(guild_id)
     v = g.get("selected_scrim")
-    if isinstance(v, str) and v.strip():
-        return v.strip()
-    return "default"
+    v = v.strip() if isinstance(v, str) and v.strip() else "default"
+    _SELECTED_SCRIM_CACHE[guild_id] = v
+    return v
 
 
 def _is_rotation_active(guild_id: int) -> bool:
@@ -430,6 +995,105 @@ def _is_rotation_active(guild_id: int) -> bool:
     return isinstance(cid, int) and isinstance(mid, int) and cid > 0 and mid > 0
 
 
+def _import_handle(mod_basename: str):
+    import importlib
+
+    # 1) 同一パッケージ相対（modules配下でロードされるケース）
+    pkg = __package__  # 例: "modules" / None
+    if pkg:
+        for name in (f"{pkg}.{mod_basename}",):
+            try:
+                mod = importlib.import_module(name)
+                fn = getattr(mod, "handle_custom_key_send", None)
+                if callable(fn):
+                    return fn
+            except Exception:
+                pass
+
+    # 2) ルート直下（開発時にPYTHONPATHへ通しているケース）
+    try:
+        mod = importlib.import_module(mod_basename)
+        fn = getattr(mod, "handle_custom_key_send", None)
+        if callable(fn):
+            return fn
+    except Exception:
+        pass
+
+    # 3) 互換: "modules.<name>" を直指定（pkgが取れないケース）
+    try:
+        mod = importlib.import_module(f"modules.{mod_basename}")
+        fn = getattr(mod, "handle_custom_key_send", None)
+        if callable(fn):
+            return fn
+    except Exception as e:
+        raise e
+
+    raise ModuleNotFoundError(mod_basename)
+
+
+# 送信処理（normal_mode / infinite_mode）へ選択中スクリム名を渡す。
+# タスクごとに値が分かれるので、複数ギルドから同時に送信しても混ざらない。
+# 送信側は `KEYDROP_SCRIM_NAME.get()` で参照する。
+KEYDROP_SCRIM_NAME: ContextVar[str] = ContextVar("KEYDROP_SCRIM_NAME", default="")
+
+
+# mod_basename -> handle_custom_key_send（解決済み）
+_HANDLE_CACHE: dict[str, object] = {}
+# mod_basename -> (再試行可能になる monotonic 時刻, 失敗時の例外)
+_HANDLE_FAILED: dict[str, tuple[float, Exception]] = {}
+_HANDLE_RETRY_SEC = 30.0
+
+
+def _get_send_handle(mod_basename: str):
+    """送信処理（handle_custom_key_send）を解決する。import は初回（と拡張リロード後）だけ行う。"""
+    fn = _HANDLE_CACHE.get(mod_basename)
+    if fn is not None:
+        # 拡張のリロードで差し替わっていなければそのまま使う
+        mod = sys.modules.get(getattr(fn, "__module__", ""))
+        if mod is not None and getattr(mod, "handle_custom_key_send", None) is fn:
+            return fn
+
+    failed = _HANDLE_FAILED.get(mod_basename)
+    if failed is not None and time.monotonic() < failed[0]:
+        raise failed[1]
+
+    try:
+        fn = _import_handle(mod_basename)
+    except Exception as e:
+        _HANDLE_FAILED[mod_basename] = (time.monotonic() + _HANDLE_RETRY_SEC, e)
+        raise
+    _HANDLE_FAILED.pop(mod_basename, None)
+    _HANDLE_CACHE[mod_basename] = fn
+    return fn
+
+
+# mod_basename -> モジュール（scrim_today / mode_flash）。ボタンごとの import 試行を省く
+_MODULE_CACHE: dict[str, object] = {}
+
+
+def _get_sibling_module(mod_basename: str):
+    """同一パッケージ → ルート直下 → modules.<name> の順で import し、結果を使い回す。"""
+    mod = _MODULE_CACHE.get(mod_basename)
+    if mod is not None and sys.modules.get(mod.__name__) is mod:
+        return mod
+
+    import importlib
+
+    names = [mod_basename, f"modules.{mod_basename}"]
+    if __package__:
+        names.insert(0, f"{__package__}.{mod_basename}")
+    err: Exception | None = None
+    for name in names:
+        try:
+            mod = importlib.import_module(name)
+        except Exception as e:
+            err = err or e
+            continue
+        _MODULE_CACHE[mod_basename] = mod
+        return mod
+    raise err or ModuleNotFoundError(mod_basename)
+
+
 async def _trigger_custom_key_send(interaction: discord.Interaction, match_no: str) -> None:
     """管理パネルの“合図”から、実際のキー画像送信（normal/infinite）を呼び出す。
 
@@ -444,50 +1108,19 @@ async def _trigger_custom_key_send(interaction: discord.Interaction, match_no: s
 
     target_mod_basename = "infinite_mode" if _is_rotation_active(interaction.guild.id) else "normal_mode"
 
-    def _import_handle(mod_basename: str):
-        import importlib
-
-        # 1) 同一パッケージ相対（modules配下でロードされるケース）
-        pkg = __package__  # 例: "modules" / None
-        if pkg:
-            for name in (f"{pkg}.{mod_basename}",):
-                try:
-                    mod = importlib.import_module(name)
-                    fn = getattr(mod, "handle_custom_key_send", None)
-                    if callable(fn):
-                        return fn
-                except Exception:
-                    pass
-
-        # 2) ルート直下（開発時にPYTHONPATHへ通しているケース）
-        try:
-            mod = importlib.import_module(mod_basename)
-            fn = getattr(mod, "handle_custom_key_send", None)
-            if callable(fn):
-                return fn
-        except Exception:
-            pass
-
-        # 3) 互換: "modules.<name>" を直指定（pkgが取れないケース）
-        try:
-            mod = importlib.import_module(f"modules.{mod_basename}")
-            fn = getattr(mod, "handle_custom_key_send", None)
-            if callable(fn):
-                return fn
-        except Exception as e:
-            raise e
-
-        raise ModuleNotFoundError(mod_basename)
-
     try:
-        _send_impl = _import_handle(target_mod_basename)
+        _send_impl = _get_send_handle(target_mod_basename)
     except Exception as e:
         await interaction.response.send_message(f"送信処理の呼び出しに失敗しました: {e}", ephemeral=True)
         return
 
     # 選択中スクリム名を keydrop 側へ渡す（タイトル生成に使用）
     try:
-        os.environ["KEYDROP_SCRIM_NAME"] = _get_selected_scrim(interaction.guild.id)
+        scrim_name = _get_selected_scrim(interaction.guild.id)
+        KEYDROP_SCRIM_NAME.set(scrim_name)
+        # 環境変数を読む送信モジュール向けの互換。値が変わるときだけ書き換える
+        if os.environ.get("KEYDROP_SCRIM_NAME") != scrim_name:
+            os.environ["KEYDROP_SCRIM_NAME"] = scrim_name
     except Exception:
         pass
 
@@ -499,36 +1132,53 @@ def _set_selected_scrim(guild_id: int, scrim_name: str) -> None:
     if not scrim_name:
         scrim_name = "default"
 
-    data = _load_settings()
+    data = _load_settings_for_update()
     gid = str(guild_id)
-    g = data.get(gid)
+    g = data.setdefault(gid, {})
     if not isinstance(g, dict):
-        g = {}
-        data[gid] = g
+        g = data[gid] = {}
 
     # 確実に新形式へ
-    if "scrims" not in g or not isinstance(g.get("scrims"), dict):
-        g["scrims"] = {"default": {}}
-    if scrim_name not in g["scrims"]:
-        g["scrims"][scrim_name] = {}
+    scrims = g.setdefault("scrims", {"default": {}})
+    if not isinstance(scrims, dict):
+        scrims = g["scrims"] = {"default": {}}
+    scrims.setdefault(scrim_name, {})
     g["selected_scrim"] = scrim_name
-    _save_settings(data)
+    _mark_dirty()
+    _SELECTED_SCRIM_CACHE.pop(guild_id, None)
+    invalidate_today_scrim_cache(guild_id)
+    _ANNOUNCE_PNG_CACHE.pop(guild_id, None)
 
 
 def _list_scrims(guild_id: int) -> list[str]:
     g = _get_guild_container(guild_id)
     scrims = g.get("scrims")
     if isinstance(scrims, dict):
-        names = [k for k in scrims.keys() if isinstance(k, str) and k.strip()]
+        names = [k for k in scrims if k != "default" and isinstance(k, str) and k.strip()]
+        names.sort()
         # default を先頭に
-        names_sorted = sorted([n for n in names if n != "default"])
-        if "default" in names:
-            return ["default"] + names_sorted
-        return names_sorted
+        if "default" in scrims:
+            names.insert(0, "default")
+        return names
     return ["default"]
 
 
+# guild_id -> (_SETTINGS_VERSION, 選択中スクリムのブロック)。
+# 埋め込み生成などで同じギルドの getter が続けて呼ばれるときの辿り直しを省く
+_SCRIM_BLOCK_CACHE: dict[int, tuple[int, dict]] = {}
+
+
 def _get_scrim_block(guild_id: int) -> dict:
+    _load_settings()  # 外部更新の検知（再読込時は _SETTINGS_VERSION が進む）
+    ent = _SCRIM_BLOCK_CACHE.get(guild_id)
+    if ent is not None and ent[0] == _SETTINGS_VERSION:
+        return ent[1]
+    b = _lookup_scrim_block(guild_id)
+    _SCRIM_BLOCK_CACHE[guild_id] = (_SETTINGS_VERSION, b)
+    return b
+
+
+def _lookup_scrim_block(guild_id: int) -> dict:
     g = _get_guild_container(guild_id)
     scrims = g.get("scrims")
     if not isinstance(scrims, dict):
@@ -536,38 +1186,40 @@ def _get_scrim_block(guild_id: int) -> dict:
     sel = _get_selected_scrim(guild_id)
     b = scrims.get(sel)
     if not isinstance(b, dict):
-        scrims[sel] = {}
-        _save_settings(_load_settings())
-        return {}
+        # 作成したブロック自体を返す（以降の書き込みがそのまま設定に反映される）
+        b = scrims[sel] = {}
+        _mark_dirty()
     return b
 
 
 def _set_scrim_value(guild_id: int, key: str, value) -> None:
-    data = _load_settings()
+    data = _load_settings_for_update()
     gid = str(guild_id)
-    g = data.get(gid)
+    g = data.setdefault(gid, {})
     if not isinstance(g, dict):
-        g = {}
-        data[gid] = g
+        g = data[gid] = {}
     # 新形式へ
-    if "scrims" not in g or not isinstance(g.get("scrims"), dict):
-        g["scrims"] = {"default": {}}
-    sel = g.get("selected_scrim")
+    scrims = g.setdefault("scrims", {"default": {}})
+    if not isinstance(scrims, dict):
+        scrims = g["scrims"] = {"default": {}}
+    sel = g.setdefault("selected_scrim", "default")
     if not isinstance(sel, str) or not sel.strip():
-        sel = "default"
-        g["selected_scrim"] = sel
-    if sel not in g["scrims"] or not isinstance(g["scrims"].get(sel), dict):
-        g["scrims"][sel] = {}
-    g["scrims"][sel][_flash_key(key)] = value
-    _save_settings(data)
+        sel = g["selected_scrim"] = "default"
+    block = scrims.setdefault(sel, {})
+    if not isinstance(block, dict):
+        block = scrims[sel] = {}
+    block[_flash_key(key)] = value
+    _mark_dirty()
 
 
 def _get_int_setting(guild_id: int, key: str) -> int | None:
     g = _get_scrim_block(guild_id)
-    v = g.get(_flash_key(key))
-    if isinstance(v, int) and v > 0:
-        return v
-    if isinstance(v, str) and v.isdigit():
+    v = g.get(_FLASH_KEY_MAP[key])
+    # セッターは int で保存するので、まずは int をそのまま返す
+    if type(v) is int:
+        return v if v > 0 else None
+    # 旧データ（数字文字列）向け
+    if type(v) is str and v.isdigit():
         iv = int(v)
         return iv if iv > 0 else None
     return None
@@ -575,18 +1227,15 @@ def _get_int_setting(guild_id: int, key: str) -> int | None:
 
 def _get_str_setting(guild_id: int, key: str) -> str | None:
     g = _get_scrim_block(guild_id)
-    v = g.get(_flash_key(key))
+    v = g.get(_FLASH_KEY_MAP[key])
     if isinstance(v, str) and v.strip():
         return v
     return None
 
 
 def _get_guild_autosend_time(guild_id: int) -> str | None:
-    g = _get_scrim_block(guild_id)
-    t = g.get(_flash_key("autosend_time"))
-    if isinstance(t, str) and _TIME_RE.match(t):
-        return t
-    return None
+    t = _get_scrim_block(guild_id).get(_AUTOSEND_TIME_KEY)
+    return t if isinstance(t, str) else None
 
 
 def _get_guild_autosend_channel_id(guild_id: int) -> int | None:
@@ -658,6 +1307,154 @@ def _role_mention(guild: discord.Guild, role_id: int | None) -> str:
     return role.mention
 
 
+class _AIMDLimiter:
+    """Discord への送信の同時実行数を、直近の応答時間で増減させる（AIMD）。
+
+    - 平均応答時間が目標以下なら同時実行数を alpha ずつ増やす
+    - 目標を超えたとき、または 429 / 502 / 503 のときは beta 倍に減らす
+    """
+
+    def __init__(
+        self,
+        *,
+        target: float = 0.5,
+        alpha: float = 0.5,
+        beta: float = 0.5,
+        c_min: int = 1,
+        c_max: int = 8,
+        window: int = 16,
+    ) -> None:
+        self._target = target
+        self._alpha = alpha
+        self._beta = beta
+        self._c_min = c_min
+        self._c_max = c_max
+        self._limit = float(c_max)
+        self._inflight = 0
+        self._cond = asyncio.Condition()
+        self._latencies: deque[float] = deque(maxlen=window)
+
+    def _decrease(self) -> None:
+        self._limit = max(float(self._c_min), self._limit * self._beta)
+
+    def _observe(self, elapsed: float) -> None:
+        lat = self._latencies
+        lat.append(elapsed)
+        if sum(lat) / len(lat) <= self._target:
+            self._limit = min(float(self._c_max), self._limit + self._alpha)
+        else:
+            self._decrease()
+
+    async def run(self, fn):
+        """fn()（コルーチンを返す関数）を同時実行数の枠内で実行する。"""
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._inflight < int(self._limit))
+            self._inflight += 1
+        t0 = time.perf_counter()
+        try:
+            result = await fn()
+        except discord.HTTPException as e:
+            if e.status in (429, 502, 503):
+                self._decrease()
+            raise
+        else:
+            self._observe(time.perf_counter() - t0)
+            return result
+        finally:
+            async with self._cond:
+                self._inflight -= 1
+                self._cond.notify_all()
+
+
+class _ChannelPacer:
+    """チャンネルごとの送信ペース制御（Discord のチャンネル単位の上限 5通/5秒 に合わせる）。
+
+    discord.py は 429 を受けてから待つが、ここでは送信前に間隔を空けて 429 自体を出さない。
+    同じチャンネルへの送信は Lock で順番待ちになる（先着順）。
+    同時実行数の AIMD もチャンネルごとに持つ（画像アップロードの遅さで他のチャンネルの送信を絞らない）。
+    送信中の呼び出しが無く、最後の送信から per 秒以上たったチャンネルの記録は捨てる。
+    """
+
+    def __init__(self, rate: int = 5, per: float = 5.0) -> None:
+        self._rate = rate
+        self._per = per
+        self._sent: dict[int, deque[float]] = {}
+        self._locks: dict[int, asyncio.Lock] = {}
+        self._limiters: dict[int, _AIMDLimiter] = {}
+        self._users: dict[int, int] = {}  # channel_id -> submit 中の呼び出し数
+        self._swept_at = 0.0
+
+    def _sweep(self, now: float) -> None:
+        """使われていないチャンネルの Lock / 送信時刻を破棄する（per 秒に1回まで）。"""
+        if now - self._swept_at < self._per:
+            return
+        self._swept_at = now
+        idle = [
+            cid for cid, sent in self._sent.items()
+            if cid not in self._users and (not sent or sent[-1] + self._per <= now)
+        ]
+        for cid in idle:
+            del self._sent[cid]
+            self._locks.pop(cid, None)
+            self._limiters.pop(cid, None)
+
+    async def _acquire(self, channel_id: int) -> None:
+        lock = self._locks.get(channel_id)
+        if lock is None:
+            lock = self._locks[channel_id] = asyncio.Lock()
+        async with lock:
+            sent = self._sent.get(channel_id)
+            if sent is None:
+                sent = self._sent[channel_id] = deque(maxlen=self._rate)
+            if len(sent) == self._rate:
+                wait = sent[0] + self._per - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            sent.append(time.monotonic())
+
+    async def submit(self, ch: discord.abc.Messageable, **kwargs) -> discord.Message:
+        channel_id = getattr(ch, "id", 0)
+        self._sweep(time.monotonic())
+        self._users[channel_id] = self._users.get(channel_id, 0) + 1
+        try:
+            await self._acquire(channel_id)
+            limiter = self._limiters.get(channel_id)
+            if limiter is None:
+                limiter = self._limiters[channel_id] = _AIMDLimiter()
+            return await limiter.run(lambda: ch.send(**kwargs))
+        finally:
+            n = self._users.pop(channel_id) - 1
+            if n:
+                self._users[channel_id] = n
+
+
+_CHANNEL_PACER = _ChannelPacer()
+
+
+# guild_id -> {role_id: mention}。存在したロールだけを入れる（ロール更新/削除イベントでギルドごと破棄）
+_ROLE_MENTION_CACHE: dict[int, dict[int, str]] = {}
+
+
+def _role_mention_cached(guild: discord.Guild, role_id: int | None) -> str:
+    if not role_id:
+        return "未設定"
+    per_guild = _ROLE_MENTION_CACHE.get(guild.id)
+    if per_guild is not None:
+        hit = per_guild.get(role_id)
+        if hit is not None:
+            return hit
+    role = guild.get_role(role_id)
+    if role is None:
+        return "未設定（存在しない / 権限不足）"
+    mention = role.mention
+    _ROLE_MENTION_CACHE.setdefault(guild.id, {})[role_id] = mention
+    return mention
+
+
+def invalidate_role_mention_cache(guild_id: int) -> None:
+    _ROLE_MENTION_CACHE.pop(guild_id, None)
+
+
 def _shorten(text: str, max_len: int = 120) -> str:
     t = (text or "").strip()
     if not t:
@@ -672,19 +1469,42 @@ def _build_admin_view(guild: discord.Guild | None = None) -> "AdminPanelView":
     return AdminPanelView(guild=guild)
 
 
+# guild_id -> (_SETTINGS_VERSION, Embed)。設定が変わっていなければ前回の Embed を複製して返す。
+# 表示中のロール/チャンネルのメンションは設定を変えずに変わるので、それらの更新/削除イベントでも破棄する
+_EMBED_CACHE: dict[int, tuple[int, discord.Embed]] = {}
+
+
+def invalidate_admin_embed_cache(guild_id: int) -> None:
+    _EMBED_CACHE.pop(guild_id, None)
+
+
 def _build_admin_embed(guild: discord.Guild) -> discord.Embed:
+    _load_settings()  # 外部更新の検知（再読込時は _SETTINGS_VERSION が進む）
+    ent = _EMBED_CACHE.get(guild.id)
+    if ent is not None and ent[0] == _SETTINGS_VERSION:
+        return ent[1].copy()
+
+    embed = _render_admin_embed(guild)
+    _EMBED_CACHE[guild.id] = (_SETTINGS_VERSION, embed)
+    return embed.copy()
+
+
+def _render_admin_embed(guild: discord.Guild) -> discord.Embed:
     t = _get_guild_autosend_time(guild.id)
     autosend_cid = _get_guild_autosend_channel_id(guild.id)
 
     keydrop_admin_cid = _get_keydrop_admin_channel_id(guild.id)
-    keydrop_host_cid = _get_keydrop_host_channel_id(guild.id)
-    keydrop_view_cid = _get_keydrop_view_channel_id(guild.id)
-
-    replay_cid = _get_replay_submit_channel_id(guild.id)
 
     keyhost_rid = _get_guild_keyhost_role_id(guild.id)
     keydrop_mode = _get_keydrop_mode(guild.id)
 
+    # 表示に使うチャンネルIDをまとめて1回だけ解決する（同じIDが重複しても引き直さない）
+    mentions = {
+        cid: _channel_mention(guild, cid)
+        for cid in {autosend_cid, keydrop_admin_cid}
+        if cid
+    }
+
     embed = discord.Embed(
         title="🛠️ Flash Scrim管理パネル",
         description="下のボタンから各設定・送信を実行します。\n\u200b",
@@ -711,7 +1531,7 @@ def _build_admin_embed(guild: discord.Guild) -> discord.Embed:
     embed.add_field(
         name="📢 スクリム案内",
         value=(
-            f"送信先：{_channel_mention(guild, autosend_cid)}\n"
+            f"送信先：{mentions.get(autosend_cid, '未設定')}\n"
             f"自動案内時間：{f'`{t}`' if t else '未設定'}\n"
             "└毎日実行し、対象スクリムと同名のスクリムがある場合のみ送信します"
         ),
@@ -720,7 +1540,7 @@ def _build_admin_embed(guild: discord.Guild) -> discord.Embed:
     embed.add_field(
         name="🔑 送信チャンネルの設定",
         value=(
-            f"運営用：{_channel_mention(guild, keydrop_admin_cid)}\n"\
+            f"運営用：{mentions.get(keydrop_admin_cid, '未設定')}\n"\
             f"配布方式　{keydrop_mode}（auto=自動 / manual=手動）"
         ),
         inline=False,
@@ -740,6 +1560,74 @@ def _build_admin_embed(guild: discord.Guild) -> discord.Embed:
 
 
 
+# 管理パネルの再描画は少し遅らせて、連続した設定変更を1回の message.edit にまとめる
+_PANEL_REFRESH_DELAY = 0.2
+_PANEL_REFRESH_TASKS: dict[int, asyncio.Task] = {}  # message.id -> 待機中の再描画タスク
+# message.id -> 最後に反映した (embed.to_dict(), 各コンポーネントの状態)。同じ内容なら edit を送らない。
+# パネルの削除時（on_raw_message_delete）と edit 失敗時に破棄し、件数も上限で抑える
+_PANEL_LAST_STATE: dict[int, tuple[dict, tuple]] = {}
+_PANEL_LAST_STATE_MAX = 64
+
+
+def _panel_signature(embed: discord.Embed, view: discord.ui.View) -> tuple[dict, tuple]:
+    """パネルの見た目を比較するための値（ラベルに加え、無効化・スタイル・custom_id・行も含める）。"""
+    return (
+        embed.to_dict(),
+        tuple(
+            (
+                type(item).__name__,
+                getattr(item, "custom_id", None),
+                getattr(item, "label", None),
+                str(getattr(item, "style", None)),
+                getattr(item, "disabled", None),
+                getattr(item, "row", None),
+            )
+            for item in view.children
+        ),
+    )
+
+
+def _forget_panel_message(message_id: int) -> None:
+    """削除・差し替えられたパネルの記録と待機中の再描画を破棄する。"""
+    _PANEL_LAST_STATE.pop(message_id, None)
+    task = _PANEL_REFRESH_TASKS.pop(message_id, None)
+    if task is not None and not task.done() and task is not asyncio.current_task():
+        task.cancel()
+
+
+def _schedule_panel_refresh(message: discord.Message | None, guild: discord.Guild) -> None:
+    """パネルの再描画を予約する。待機中の予約があれば、それが最新の状態で描画するので何もしない。"""
+    if message is None:
+        return
+    task = _PANEL_REFRESH_TASKS.get(message.id)
+    if task is not None and not task.done():
+        return
+    _PANEL_REFRESH_TASKS[message.id] = asyncio.create_task(_refresh_panel_later(message, guild))
+
+
+async def _refresh_panel_later(message: discord.Message, guild: discord.Guild) -> None:
+    try:
+        await asyncio.sleep(_PANEL_REFRESH_DELAY)
+        # 描画直前に予約を外す（描画中に来た変更は次の予約で反映される）
+        _PANEL_REFRESH_TASKS.pop(message.id, None)
+        embed = _build_admin_embed(guild)
+        view = _build_admin_view(guild)
+        state = _panel_signature(embed, view)
+        if _PANEL_LAST_STATE.get(message.id) == state:
+            return
+        await message.edit(embed=embed, view=view)
+        _PANEL_LAST_STATE.pop(message.id, None)
+        if len(_PANEL_LAST_STATE) >= _PANEL_LAST_STATE_MAX:
+            _PANEL_LAST_STATE.pop(next(iter(_PANEL_LAST_STATE)))
+        _PANEL_LAST_STATE[message.id] = state
+    except Exception:
+        # 削除済み（NotFound）など。実際の表示が分からないので記録を捨てる
+        _PANEL_LAST_STATE.pop(message.id, None)
+    finally:
+        if _PANEL_REFRESH_TASKS.get(message.id) is asyncio.current_task():
+            _PANEL_REFRESH_TASKS.pop(message.id, None)
+
+
 def _build_scrim_today_announce_content(guild: discord.Guild) -> str:
     """/scrim_today_one と同一の案内文生成に使う共通関数。
     - 管理パネルで設定した「対象スクリム（selected_scrim）」を必ず使用する
@@ -778,12 +1666,9 @@ class WaitingLineDoneView(discord.ui.View):
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(timeout=None)
 
-# builtins にも注入して NameError を回避
-try:
-    if not hasattr(_builtins, "WaitingLineDoneView"):
-        setattr(_builtins, "WaitingLineDoneView", WaitingLineDoneView)
-except Exception:
-    pass
+# builtins にも注入して NameError を回避（リロード時は既存のものをそのまま使う）
+if "WaitingLineDoneView" not in _builtins.__dict__:
+    _builtins.WaitingLineDoneView = WaitingLineDoneView
 
 class AutoSendTimeModal(discord.ui.Modal):
     title = "スクリム案内：時間設定"
@@ -808,7 +1693,7 @@ class AutoSendTimeModal(discord.ui.Modal):
             return
 
         value = (self.time_input.value or "").strip()
-        if not _TIME_RE.match(value):
+        if not _is_valid_time(value):
             await interaction.response.send_message(
                 "時刻の形式が正しくありません。`HH:MM`（24時間、例：`17:00`）で入力してください。",
                 ephemeral=True,
@@ -817,15 +1702,66 @@ class AutoSendTimeModal(discord.ui.Modal):
 
         _set_scrim_value(interaction.guild.id, "autosend_time", value)
 
-        try:
-            if self._panel_message is not None:
-                await self._panel_message.edit(embed=_build_admin_embed(interaction.guild), view=_build_admin_view(interaction.guild))
-        except Exception:
-            pass
+        _schedule_panel_refresh(self._panel_message, interaction.guild)
 
         await interaction.response.send_message(f"自動案内の時刻を `{value}` に設定しました。", ephemeral=True)
 
 
+class _SettingChannelSelect(discord.ui.ChannelSelect):
+    """選択したチャンネルIDを1つの設定キーへ保存する ChannelSelect。
+
+    権限チェックは親 View の interaction_check で済ませている前提。
+    """
+
+    def __init__(self, *, setting_key: str, label: str, **kwargs) -> None:
+        super().__init__(min_values=1, max_values=1, **kwargs)
+        self._setting_key = setting_key
+        self._label = label
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        if interaction.guild is None:
+            await interaction.response.send_message("サーバー内で実行してください。", ephemeral=True)
+            return
+        if not self.values:
+            await interaction.response.send_message("チャンネルが選択されていません。", ephemeral=True)
+            return
+
+        ch_id = int(self.values[0].id)
+        _set_scrim_value(interaction.guild.id, self._setting_key, ch_id)
+        msg = f"{self._label}を {_channel_mention(interaction.guild, ch_id)} に設定しました。"
+
+        _schedule_panel_refresh(getattr(self.view, "_panel_message", None), interaction.guild)
+
+        await interaction.response.send_message(msg, ephemeral=True)
+
+
+class _SettingRoleSelect(discord.ui.RoleSelect):
+    """選択したロールIDを1つの設定キーへ保存する RoleSelect（_SettingChannelSelect のロール版）。"""
+
+    def __init__(self, *, setting_key: str, label: str, **kwargs) -> None:
+        super().__init__(min_values=1, max_values=1, **kwargs)
+        self._setting_key = setting_key
+        self._label = label
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        if interaction.guild is None:
+            await interaction.response.send_message("サーバー内で実行してください。", ephemeral=True)
+            return
+        if not self.values:
+            await interaction.response.send_message("ロールが選択されていません。", ephemeral=True)
+            return
+
+        role_id = int(self.values[0].id)
+        _set_scrim_value(interaction.guild.id, self._setting_key, role_id)
+
+        _schedule_panel_refresh(getattr(self.view, "_panel_message", None), interaction.guild)
+
+        await interaction.response.send_message(
+            f"{self._label}を {_role_mention_cached(interaction.guild, role_id)} に設定しました。",
+            ephemeral=True,
+        )
+
+
 class ScrimAnnounceConfigView(discord.ui.View):
     """スクリム案内の設定ビュー（チャンネル選択 + 時間設定）。"""
 
@@ -834,17 +1770,19 @@ class ScrimAnnounceConfigView(discord.ui.View):
         self._panel_message = panel_message
 
         self.add_item(
-            discord.ui.ChannelSelect(
+            _SettingChannelSelect(
+                setting_key="autosend_channel_id",
+                label="送信先チャンネル",
                 placeholder="送信先チャンネルを選択",
                 channel_types=[discord.ChannelType.text],
-                min_values=1,
-                max_values=1,
                 custom_id="scrim_admin:autosend_channel_select",
             )
         )
 
         self.add_item(
-            discord.ui.ChannelSelect(
+            _SettingChannelSelect(
+                setting_key="keydrop_admin_channel_id",
+                label="運営用チャンネル",
                 placeholder="運営用チャンネルを選択",
                 channel_types=[
                     discord.ChannelType.text,
@@ -852,8 +1790,6 @@ class ScrimAnnounceConfigView(discord.ui.View):
                     discord.ChannelType.private_thread,
                     discord.ChannelType.news_thread,
                 ],
-                min_values=1,
-                max_values=1,
                 custom_id="scrim_admin:keydrop_admin_channel_select",
             )
         )
@@ -863,37 +1799,6 @@ class ScrimAnnounceConfigView(discord.ui.View):
             await interaction.response.send_message("この操作は管理者のみ実行できます。", ephemeral=True)
             return False
 
-        # ChannelSelect
-        if interaction.data and interaction.data.get("component_type") == 8:
-            if interaction.guild is None:
-                await interaction.response.send_message("サーバー内で実行してください。", ephemeral=True)
-                return False
-
-            custom_id = interaction.data.get("custom_id")
-            values = interaction.data.get("values") or []
-            if not values:
-                await interaction.response.send_message("チャンネルが選択されていません。", ephemeral=True)
-                return False
-
-            ch_id = int(values[0])
-            if custom_id == "scrim_admin:autosend_channel_select":
-                _set_scrim_value(interaction.guild.id, "autosend_channel_id", ch_id)
-                msg = f"送信先チャンネルを {_channel_mention(interaction.guild, ch_id)} に設定しました。"
-            elif custom_id == "scrim_admin:keydrop_admin_channel_select":
-                _set_scrim_value(interaction.guild.id, "keydrop_admin_channel_id", ch_id)
-                msg = f"運営用チャンネルを {_channel_mention(interaction.guild, ch_id)} に設定しました。"
-            else:
-                msg = "不明なチャンネル選択です。"
-
-            try:
-                if self._panel_message is not None:
-                    await self._panel_message.edit(embed=_build_admin_embed(interaction.guild), view=_build_admin_view(interaction.guild))
-            except Exception:
-                pass
-
-            await interaction.response.send_message(msg, ephemeral=True)
-            return False
-
         return True
 
     @discord.ui.button(label="時間設定", style=discord.ButtonStyle.primary, custom_id="scrim_admin:autosend_time_modal", row=1)
@@ -913,7 +1818,9 @@ class KeydropChannelsConfigView(discord.ui.View):
         self._panel_message = panel_message
 
         self.add_item(
-            discord.ui.ChannelSelect(
+            _SettingChannelSelect(
+                setting_key="keydrop_admin_channel_id",
+                label="運営用チャンネル",
                 placeholder="運営用チャンネルを選択",
                 channel_types=[
                     discord.ChannelType.text,
@@ -921,15 +1828,15 @@ class KeydropChannelsConfigView(discord.ui.View):
                     discord.ChannelType.private_thread,
                     discord.ChannelType.news_thread,
                 ],
-                min_values=1,
-                max_values=1,
                 custom_id="scrim_admin:keydrop_admin_channel_select",
                 row=0,
             )
         )
 
         self.add_item(
-            discord.ui.ChannelSelect(
+            _SettingChannelSelect(
+                setting_key="keydrop_host_channel_id",
+                label="キーホスト用チャンネル",
                 placeholder="キーホスト用チャンネルを選択",
                 channel_types=[
                     discord.ChannelType.text,
@@ -937,14 +1844,14 @@ class KeydropChannelsConfigView(discord.ui.View):
                     discord.ChannelType.private_thread,
                     discord.ChannelType.news_thread,
                 ],
-                min_values=1,
-                max_values=1,
                 custom_id="scrim_admin:keydrop_host_channel_select",
                 row=1,
             )
         )
         self.add_item(
-            discord.ui.ChannelSelect(
+            _SettingChannelSelect(
+                setting_key="keydrop_view_channel_id",
+                label="閲覧用チャンネル",
                 placeholder="閲覧用チャンネルを選択",
                 channel_types=[
                     discord.ChannelType.text,
@@ -952,15 +1859,15 @@ class KeydropChannelsConfigView(discord.ui.View):
                     discord.ChannelType.private_thread,
                     discord.ChannelType.news_thread,
                 ],
-                min_values=1,
-                max_values=1,
                 custom_id="scrim_admin:keydrop_view_channel_select",
                 row=2,
             )
         )
 
         self.add_item(
-            discord.ui.ChannelSelect(
+            _SettingChannelSelect(
+                setting_key="replay_submit_channel_id",
+                label="リプレイデータ提出チャンネル",
                 placeholder="リプレイデータ提出チャンネルを選択",
                 channel_types=[
                     discord.ChannelType.text,
@@ -968,8 +1875,6 @@ class KeydropChannelsConfigView(discord.ui.View):
                     discord.ChannelType.private_thread,
                     discord.ChannelType.news_thread,
                 ],
-                min_values=1,
-                max_values=1,
                 custom_id="scrim_admin:replay_submit_channel_select",
                 row=3,
             )
@@ -980,44 +1885,6 @@ class KeydropChannelsConfigView(discord.ui.View):
             await interaction.response.send_message("この操作は管理者のみ実行できます。", ephemeral=True)
             return False
 
-        # ChannelSelect
-        if interaction.data and interaction.data.get("component_type") == 8:
-            if interaction.guild is None:
-                await interaction.response.send_message("サーバー内で実行してください。", ephemeral=True)
-                return False
-
-            custom_id = interaction.data.get("custom_id")
-            values = interaction.data.get("values") or []
-            if not values:
-                await interaction.response.send_message("チャンネルが選択されていません。", ephemeral=True)
-                return False
-
-            ch_id = int(values[0])
-
-            if custom_id == "scrim_admin:keydrop_admin_channel_select":
-                _set_scrim_value(interaction.guild.id, "keydrop_admin_channel_id", ch_id)
-                msg = f"運営用チャンネルを {_channel_mention(interaction.guild, ch_id)} に設定しました。"
-            elif custom_id == "scrim_admin:keydrop_host_channel_select":
-                _set_scrim_value(interaction.guild.id, "keydrop_host_channel_id", ch_id)
-                msg = f"キーホスト用チャンネルを {_channel_mention(interaction.guild, ch_id)} に設定しました。"
-            elif custom_id == "scrim_admin:keydrop_view_channel_select":
-                _set_scrim_value(interaction.guild.id, "keydrop_view_channel_id", ch_id)
-                msg = f"閲覧用チャンネルを {_channel_mention(interaction.guild, ch_id)} に設定しました。"
-            elif custom_id == "scrim_admin:replay_submit_channel_select":
-                _set_scrim_value(interaction.guild.id, "replay_submit_channel_id", ch_id)
-                msg = f"リプレイデータ提出チャンネルを {_channel_mention(interaction.guild, ch_id)} に設定しました。"
-            else:
-                msg = "不明なチャンネル選択です。"
-
-            try:
-                if self._panel_message is not None:
-                    await self._panel_message.edit(embed=_build_admin_embed(interaction.guild), view=_build_admin_view(interaction.guild))
-            except Exception:
-                pass
-
-            await interaction.response.send_message(msg, ephemeral=True)
-            return False
-
         return True
 
     @discord.ui.button(label="閉じる", style=discord.ButtonStyle.secondary, custom_id="scrim_admin:keydrop_close", row=4)
@@ -1098,6 +1965,7 @@ class KeyhostRecruitView(discord.ui.View):
             await interaction.response.send_message("❌ キーホスト確定がキャンセルされました。", ephemeral=True)
 
 
+@functools.lru_cache(maxsize=64)
 def _build_keyhost_recruit_message(role_mention: str) -> str:
     return (
         "🔸キーホスト募集\n"
@@ -1115,10 +1983,10 @@ class KeyhostConfigView(discord.ui.View):
         self._panel_message = panel_message
 
         self.add_item(
-            discord.ui.RoleSelect(
+            _SettingRoleSelect(
+                setting_key="keyhost_allowed_role_id",
+                label="募集ボタンを押せるロール",
                 placeholder="募集ボタンを押せるロールを選択",
-                min_values=1,
-                max_values=1,
                 custom_id="scrim_admin:keyhost_role_select",
             )
         )
@@ -1128,34 +1996,11 @@ class KeyhostConfigView(discord.ui.View):
             await interaction.response.send_message("この操作は管理者のみ実行できます。", ephemeral=True)
             return False
 
-        # RoleSelect
-        if interaction.data and interaction.data.get("component_type") == 6:
-            if interaction.guild is None:
-                await interaction.response.send_message("サーバー内で実行してください。", ephemeral=True)
-                return False
-
-            values = interaction.data.get("values") or []
-            if not values:
-                await interaction.response.send_message("ロールが選択されていません。", ephemeral=True)
-                return False
-
-            role_id = int(values[0])
-            _set_scrim_value(interaction.guild.id, "keyhost_allowed_role_id", role_id)
-
-            try:
-                if self._panel_message is not None:
-                    await self._panel_message.edit(embed=_build_admin_embed(interaction.guild), view=_build_admin_view(interaction.guild))
-            except Exception:
-                pass
-
-            await interaction.response.send_message(
-                f"募集ボタンを押せるロールを {_role_mention(interaction.guild, role_id)} に設定しました。",
-                ephemeral=True,
-            )
-            return False
-
         return True
 
+    async def on_timeout(self) -> None:
+        self._panel_message = None
+
     @discord.ui.button(label="送信", style=discord.ButtonStyle.success, custom_id="scrim_admin:keyhost_send", row=1)
     async def send(self, interaction: discord.Interaction, _: discord.ui.Button) -> None:
         if interaction.guild is None:
@@ -1180,19 +2025,21 @@ class KeyhostConfigView(discord.ui.View):
             await interaction.response.send_message("募集ボタンを押せるロールが未設定です。先にロールを選択してください。", ephemeral=True)
             return
 
-        role_mention = _role_mention(interaction.guild, rid)
+        role_mention = _role_mention_cached(interaction.guild, rid)
         content = _build_keyhost_recruit_message(role_mention)
 
+        # 送信ペースの順番待ちで 3 秒の応答期限を過ぎないよう、先に defer する
+        await interaction.response.defer(ephemeral=True)
         try:
-            await ch.send(content=content, view=KeyhostRecruitView(allowed_role_id=rid))
+            await _CHANNEL_PACER.submit(ch, content=content, view=KeyhostRecruitView(allowed_role_id=rid))
         except discord.Forbidden:
-            await interaction.response.send_message("送信先チャンネルに送信する権限がありません。", ephemeral=True)
+            await interaction.followup.send("送信先チャンネルに送信する権限がありません。", ephemeral=True)
             return
         except Exception:
-            await interaction.response.send_message("送信に失敗しました（不明なエラー）。", ephemeral=True)
+            await interaction.followup.send("送信に失敗しました（不明なエラー）。", ephemeral=True)
             return
 
-        await interaction.response.send_message(f"キーホスト募集を {ch.mention} に送信しました。", ephemeral=True)
+        await interaction.followup.send(f"キーホスト募集を {ch.mention} に送信しました。", ephemeral=True)
 
     @discord.ui.button(label="閉じる", style=discord.ButtonStyle.secondary, custom_id="scrim_admin:keyhost_close", row=1)
     async def close(self, interaction: discord.Interaction, _: discord.ui.Button) -> None:
@@ -1208,10 +2055,10 @@ class KeyhostPermissionView(discord.ui.View):
         self._panel_message = panel_message
 
         self.add_item(
-            discord.ui.RoleSelect(
+            _SettingRoleSelect(
+                setting_key="keyhost_allowed_role_id",
+                label="キーホスト権限ロール",
                 placeholder="キーホスト募集ボタンを押せるロールを選択",
-                min_values=1,
-                max_values=1,
                 custom_id="scrim_admin:keyhost_role_select",
             )
         )
@@ -1221,32 +2068,6 @@ class KeyhostPermissionView(discord.ui.View):
             await interaction.response.send_message("この操作は管理者のみ実行できます。", ephemeral=True)
             return False
 
-        # RoleSelect
-        if interaction.data and interaction.data.get("component_type") == 6:
-            if interaction.guild is None:
-                await interaction.response.send_message("サーバー内で実行してください。", ephemeral=True)
-                return False
-
-            values = interaction.data.get("values") or []
-            if not values:
-                await interaction.response.send_message("ロールが選択されていません。", ephemeral=True)
-                return False
-
-            role_id = int(values[0])
-            _set_scrim_value(interaction.guild.id, "keyhost_allowed_role_id", role_id)
-
-            try:
-                if self._panel_message is not None:
-                    await self._panel_message.edit(embed=_build_admin_embed(interaction.guild), view=_build_admin_view(interaction.guild))
-            except Exception:
-                pass
-
-            await interaction.response.send_message(
-                f"キーホスト権限ロールを {_role_mention(interaction.guild, role_id)} に設定しました。",
-                ephemeral=True,
-            )
-            return False
-
         return True
 
     @discord.ui.button(label="閉じる", style=discord.ButtonStyle.secondary, custom_id="scrim_admin:keyhost_perm_close", row=1)
@@ -1288,11 +2109,7 @@ class EndMessageModal(discord.ui.Modal):
 
         _set_scrim_value(interaction.guild.id, "end_message_text", text)
 
-        try:
-            if self._panel_message is not None:
-                await self._panel_message.edit(embed=_build_admin_embed(interaction.guild), view=_build_admin_view(interaction.guild))
-        except Exception:
-            pass
+        _schedule_panel_refresh(self._panel_message, interaction.guild)
 
         await interaction.response.send_message("終了案内文を保存しました。", ephemeral=True)
 
@@ -1329,19 +2146,22 @@ class CustomKeySendModal(discord.ui.Modal):
             # 未入力なら自動採番（日付ごと＆スクリム名ごとに 01 から）
             match_no = _next_match_no(interaction.guild.id)
         else:
-            # 数字のみ抽出（01 など対応）
-            try:
+            # 数字のみ抽出（01 など対応）。通常は数字だけなので例外処理を挟まず int へ
+            if raw.isascii() and raw.isdigit():
                 m = int(raw)
-            except Exception:
-                digits = re.sub(r"[^0-9]", "", raw)
-                if not digits:
-                    await interaction.response.send_message("試合番号は数字で入力してください（例：01）。", ephemeral=True)
-                    return
-                m = int(digits)
+            else:
+                try:
+                    m = int(raw)  # "-1" などは従来どおり下の範囲チェックで弾く
+                except ValueError:
+                    digits = _NON_DIGIT.sub("", raw)
+                    if not digits:
+                        await interaction.response.send_message("試合番号は数字で入力してください（例：01）。", ephemeral=True)
+                        return
+                    m = int(digits)
             if m < 1:
                 await interaction.response.send_message("試合番号は 1 以上で入力してください。", ephemeral=True)
                 return
-            match_no = f"{m:02d}"
+            match_no = _format_match_no(m)
             _set_manual_match_counter(interaction.guild.id, m)
 
 
@@ -1398,7 +2218,7 @@ class FlashThresholdModal(discord.ui.Modal):
         v = (v or "").strip()
         if not v:
             return None
-        digits = re.sub(r"[^0-9]", "", v)
+        digits = _NON_DIGIT.sub("", v)
         if digits == "":
             return None
         try:
@@ -1425,11 +2245,7 @@ class FlashThresholdModal(discord.ui.Modal):
         thresholds = {"ソロ": max(0, s), "デュオ": max(0, d), "トリオ": max(0, t), "スクワッド": max(0, q)}
         _set_flash_thresholds(interaction.guild.id, thresholds)
 
-        try:
-            if self._panel_message is not None:
-                await self._panel_message.edit(embed=_build_admin_embed(interaction.guild), view=_build_admin_view(interaction.guild))
-        except Exception:
-            pass
+        _schedule_panel_refresh(self._panel_message, interaction.guild)
 
         await interaction.response.send_message("基準値を保存しました。", ephemeral=True)
 
@@ -1469,16 +2285,42 @@ class InputScrimModal(discord.ui.Modal):
         _set_selected_scrim(interaction.guild.id, name)
 
         # パネル更新
-        try:
-            if self._panel_message is not None:
-                await self._panel_message.edit(embed=_build_admin_embed(interaction.guild), view=_build_admin_view(interaction.guild))
-        except Exception:
-            pass
+        _schedule_panel_refresh(self._panel_message, interaction.guild)
 
         await interaction.response.send_message(f"対象スクリムを `{name}` に設定しました。", ephemeral=True)
 
 
 
+# guild_id -> (キー, PNG)。同じ日に同じ内容の案内画像を作り直さないためのキャッシュ。
+# キーに日付と対象イベントの内容を含めるので、日付が変わるか予定が変われば作り直す。
+# 保存時に前日以前の分を捨て、件数も上限で抑える（PNG はそれなりに大きい）
+_ANNOUNCE_PNG_CACHE: dict[int, tuple[tuple, bytes]] = {}
+_ANNOUNCE_PNG_CACHE_MAX = 32
+
+
+def _announce_event_key(e) -> tuple:
+    """画像に描画されるイベントの内容を、比較できる安定した値にする（repr やオブジェクトIDに依存しない）。"""
+    if dataclasses.is_dataclass(e):
+        fields = {f.name: getattr(e, f.name, None) for f in dataclasses.fields(e)}
+    elif callable(getattr(e, "_asdict", None)):
+        fields = e._asdict()
+    else:
+        fields = getattr(e, "__dict__", None)
+    if isinstance(fields, dict):
+        return tuple(sorted((k, str(v)) for k, v in fields.items() if not k.startswith("_")))
+    return (str(getattr(e, "id", "")), str(getattr(e, "title", "")), str(getattr(e, "start", "")))
+
+
+def _store_announce_png(guild_id: int, key: tuple, png: bytes) -> None:
+    today = key[0]
+    for gid in [g for g, (k, _png) in _ANNOUNCE_PNG_CACHE.items() if k[0] != today]:
+        del _ANNOUNCE_PNG_CACHE[gid]
+    _ANNOUNCE_PNG_CACHE.pop(guild_id, None)
+    if len(_ANNOUNCE_PNG_CACHE) >= _ANNOUNCE_PNG_CACHE_MAX:
+        _ANNOUNCE_PNG_CACHE.pop(next(iter(_ANNOUNCE_PNG_CACHE)))
+    _ANNOUNCE_PNG_CACHE[guild_id] = (key, png)
+
+
 class AdminPanelView(discord.ui.View):
     """管理パネル用のView。"""
 
@@ -1535,14 +2377,14 @@ class AdminPanelView(discord.ui.View):
             await interaction.response.send_message("サーバー内で実行してください。", ephemeral=True)
             return
 
+        # 3秒以内の応答期限に間に合うよう、重い処理（DB確認・画像生成）の前に defer（実行者のみ表示）
+        await interaction.response.defer(thinking=True, ephemeral=True)
+
         # 当日のスクリムが無い場合は送信しない（大会は除外）
-        if not _has_today_scrim_excluding_tournament(interaction.guild.id):
-            await interaction.response.send_message("本日はスクリムがありません。", ephemeral=True)
+        if not await has_today_scrim_async(interaction.guild.id):
+            await interaction.followup.send("本日はスクリムがありません。", ephemeral=True)
             return
 
-        # 画像生成が重いので、先に defer（実行者のみ表示）
-        await interaction.response.defer(thinking=True, ephemeral=True)
-
         cid = _get_guild_autosend_channel_id(interaction.guild.id)
         if not cid:
             await interaction.followup.send(
@@ -1563,27 +2405,31 @@ class AdminPanelView(discord.ui.View):
             return
 
         try:
-            try:
-                from . import scrim_today as st  # type: ignore
-            except Exception:
-                import scrim_today as st  # type: ignore
+            st = _get_sibling_module("scrim_today")
 
             events = st.load_today_events(st._db_path())
             key = scrim_name.strip()
-            picked = [e for e in events if key.casefold() in (e.title or "").casefold()]
+            needle = key.casefold()
+            picked = [e for e in events if needle in (e.title or "").casefold()]
 
             if not picked:
                 await interaction.followup.send(f"本日の予定に「{scrim_name}」は見つかりませんでした。", ephemeral=True)
                 return
 
             server_name = interaction.guild.name
-            html = st.render_today_html(picked, server_name)
-            png = await st.html_to_png_bytes_like_legacy(html)
+            png_key = (_today_jst(), key, server_name, tuple(_announce_event_key(e) for e in picked))
+            cached = _ANNOUNCE_PNG_CACHE.get(interaction.guild.id)
+            if cached is not None and cached[0] == png_key:
+                png = cached[1]
+            else:
+                html = st.render_today_html(picked, server_name)
+                png = await st.html_to_png_bytes_like_legacy(html)
+                _store_announce_png(interaction.guild.id, png_key, png)
 
             safe = "".join(c for c in key if c.isalnum() or c in ("-", "_"))[:24] or "one"
             filename = f"scrim_today_{datetime.now(_JST).strftime('%Y%m%d')}_{safe}.png"
 
-            await ch.send(file=discord.File(fp=io.BytesIO(png), filename=filename))
+            await _CHANNEL_PACER.submit(ch, file=discord.File(fp=io.BytesIO(png), filename=filename))
 
             # flash なら 2通目（メッセージ①）を投稿（scrim_today 側と同じ）
             try:
@@ -1608,14 +2454,16 @@ class AdminPanelView(discord.ui.View):
             await interaction.response.send_message("サーバー内で実行してください。", ephemeral=True)
             return
 
+        # 既に ON なら書き込みもパネル更新もしない
+        if _get_flash_auto_start(interaction.guild.id):
+            await interaction.response.send_message("自動開始は既に ON です。", ephemeral=True)
+            return
+
         _set_flash_auto_start(interaction.guild.id, True)
 
         # パネル更新（✅表示）
-        try:
-            if isinstance(interaction.message, discord.Message):
-                await interaction.message.edit(embed=_build_admin_embed(interaction.guild), view=_build_admin_view(interaction.guild))
-        except Exception:
-            pass
+        if isinstance(interaction.message, discord.Message):
+            _schedule_panel_refresh(interaction.message, interaction.guild)
 
         await interaction.response.send_message("自動開始を ON にしました。", ephemeral=True)
 
@@ -1628,20 +2476,18 @@ class AdminPanelView(discord.ui.View):
             return
 
         # 当日のスクリムが無い場合は開始しない（大会は除外）
-        if not _has_today_scrim_excluding_tournament(interaction.guild.id):
+        if not await has_today_scrim_async(interaction.guild.id):
             await interaction.response.send_message("本日はスクリムがありません。", ephemeral=True)
             return
 
-        # 自動開始をOFF（手動開始）
-        _set_flash_auto_start(interaction.guild.id, False)
-        _mark_flash_auto_started_today(interaction.guild.id)
+        # 自動開始をOFF（手動開始）。既に OFF ならフラグ書き込みとパネル更新は省く
+        if _get_flash_auto_start(interaction.guild.id):
+            _set_flash_auto_start(interaction.guild.id, False)
 
-        # パネル更新（✅表示）
-        try:
+            # パネル更新（✅表示）
             if isinstance(interaction.message, discord.Message):
-                await interaction.message.edit(embed=_build_admin_embed(interaction.guild), view=_build_admin_view(interaction.guild))
-        except Exception:
-            pass
+                _schedule_panel_refresh(interaction.message, interaction.guild)
+        _mark_flash_auto_started_today(interaction.guild.id)
 
         # 手動開始：Match #NN を開始（未入力扱いで自動採番）
         match_no = _next_match_no(interaction.guild.id)
@@ -1656,14 +2502,17 @@ class AdminPanelView(discord.ui.View):
             await interaction.response.send_message("サーバー内で実行してください。", ephemeral=True)
             return
 
+        # 応答期限（3秒）に間に合うよう、DB確認の前に defer（実行者のみ表示）
+        await interaction.response.defer(thinking=True, ephemeral=True)
+
         # 当日のスクリムが無い場合は送信しない（大会は除外）
-        if not _has_today_scrim_excluding_tournament(interaction.guild.id):
-            await interaction.response.send_message("本日はスクリムがありません。", ephemeral=True)
+        if not await has_today_scrim_async(interaction.guild.id):
+            await interaction.followup.send("本日はスクリムがありません。", ephemeral=True)
             return
 
         cid = _get_guild_autosend_channel_id(interaction.guild.id)
         if not cid:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "送信先CHが未設定です。先に「CH・時間設定」で送信先チャンネルを設定してください。",
                 ephemeral=True,
             )
@@ -1671,38 +2520,28 @@ class AdminPanelView(discord.ui.View):
 
         ch = _resolve_messageable(interaction.guild, cid)
         if ch is None:
-            await interaction.response.send_message("送信先チャンネルが見つかりません。", ephemeral=True)
+            await interaction.followup.send("送信先チャンネルが見つかりません。", ephemeral=True)
             return
 
         scrim_name = (_get_selected_scrim(interaction.guild.id) or "").strip()
         if not scrim_name or scrim_name == "default":
-            await interaction.response.send_message("対象スクリム名が未設定です。先に「対象スクリム」で入力してください。", ephemeral=True)
+            await interaction.followup.send("対象スクリム名が未設定です。先に「対象スクリム」で入力してください。", ephemeral=True)
             return
 
-        await interaction.response.defer(thinking=True, ephemeral=True)
-
         # 本日のイベントを拾って mode_flash 側へ渡す
         try:
-            try:
-                from . import scrim_today as st  # type: ignore
-            except Exception:
-                import scrim_today as st  # type: ignore
+            st = _get_sibling_module("scrim_today")
 
             events = st.load_today_events(st._db_path())
             key = scrim_name.strip()
-            picked = [e for e in events if key.casefold() in (e.title or "").casefold()]
+            needle = key.casefold()
+            picked = [e for e in events if needle in (e.title or "").casefold()]
             if not picked:
                 await interaction.followup.send(f"本日の予定に「{scrim_name}」は見つかりませんでした。", ephemeral=True)
                 return
 
             # mode_flash（flash）へ送信
-            try:
-                from . import mode_flash as mf  # type: ignore
-            except Exception:
-                try:
-                    import mode_flash as mf  # type: ignore
-                except Exception:
-                    import modules.mode_flash as mf  # type: ignore
+            mf = _get_sibling_module("mode_flash")
 
             await mf.maybe_post_rotation_message(ch, interaction.guild.id, picked)
         except Exception as e:
@@ -1752,6 +2591,13 @@ class AdminPanelView(discord.ui.View):
         await interaction.response.send_modal(FlashThresholdModal(panel_message=panel_message, initial=_get_flash_thresholds(interaction.guild.id)))
 
 
+# スレッド招待の同時実行数（Discord のルート単位レート制限に当たらない程度）
+_INVITE_CONCURRENCY = 5
+
+# 起動時のギルドコマンド削除（tree.sync）の同時実行数
+_GUILD_SYNC_CONCURRENCY = 5
+
+
 class ThreadInviteSelectView(discord.ui.View):
     def __init__(self, thread: discord.Thread):
         super().__init__(timeout=180)
@@ -1770,9 +2616,17 @@ class ThreadInviteSelectView(discord.ui.View):
         self._user_select_item.callback = self._on_user_select  # type: ignore
         self.add_item(self._user_select_item)
 
+    async def on_timeout(self) -> None:
+        # 期限切れ後は押されないので、保持しているユーザー/スレッド参照を早めに手放す
+        self.selected_user_ids.clear()
+        self.thread = None  # type: ignore[assignment]
+        self._user_select_item = None  # type: ignore[assignment]
+        self.clear_items()
+
     async def _on_user_select(self, interaction: discord.Interaction):
         users = list(getattr(self._user_select_item, "values", []) or [])
-        self.selected_user_ids = [u.id for u in users if getattr(u, "id", None)]
+        # 同じユーザーが重複して来ても add_user を2回呼ばないよう、順序を保ったまま重複を除く
+        self.selected_user_ids = list(dict.fromkeys(u.id for u in users if getattr(u, "id", None)))
 
         def _disp(u) -> str:
             if isinstance(u, discord.Member):
@@ -1800,27 +2654,36 @@ class ThreadInviteSelectView(discord.ui.View):
             await interaction.response.send_message("サーバー内で実行してください。", ephemeral=True)
             return
 
-        ok = 0
-        ng: list[str] = []
-        for uid in self.selected_user_ids:
-            try:
-                m = interaction.guild.get_member(uid)
-                if m is None:
-                    try:
-                        m = await interaction.guild.fetch_member(uid)
-                    except Exception:
-                        m = None
+        guild = interaction.guild
+        # 1人ずつ待つと人数分の往復になるので、同時実行数を絞って並列に招待する
+        sem = asyncio.Semaphore(_INVITE_CONCURRENCY)
+        members: dict[int, discord.Member] = {}  # 解決済みメンバー（失敗時の表示名にも使う）
 
-                if m is None:
-                    ng.append(str(uid))
-                    continue
+        async def _invite(uid: int) -> str | None:
+            """成功なら None、失敗なら表示用の名前を返す。"""
+            async with sem:
+                try:
+                    m = guild.get_member(uid)
+                    if m is None:
+                        try:
+                            m = await guild.fetch_member(uid)
+                        except Exception:
+                            m = None
+
+                    if m is None:
+                        return str(uid)
+
+                    members[uid] = m
+                    await self.thread.add_user(m)
+                    return None
+                except Exception:
+                    # 可能なら表示名
+                    m2 = members.get(uid)
+                    return m2.display_name if m2 else str(uid)
 
-                await self.thread.add_user(m)
-                ok += 1
-            except Exception:
-                # 可能なら表示名
-                m2 = interaction.guild.get_member(uid)
-                ng.append(m2.display_name if m2 else str(uid))
+        results = await asyncio.gather(*(_invite(uid) for uid in self.selected_user_ids))
+        ng: list[str] = [r for r in results if r is not None]
+        ok = len(results) - len(ng)
 
         msg = f"招待しました: {ok}人"
         if ng:
@@ -1841,6 +2704,36 @@ class FlashAdmin(commands.Cog):
         self._guild_sync_done = False  # guild-scoped sync for instant command visibility
         self._flash_auto_task: asyncio.Task | None = None
 
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role) -> None:
+        invalidate_role_mention_cache(after.guild.id)
+        invalidate_admin_embed_cache(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        invalidate_role_mention_cache(role.guild.id)
+        invalidate_admin_embed_cache(role.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel) -> None:
+        invalidate_admin_embed_cache(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        invalidate_admin_embed_cache(channel.guild.id)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent) -> None:
+        _forget_panel_message(payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent) -> None:
+        for mid in payload.message_ids:
+            _forget_panel_message(mid)
+
+    async def cog_unload(self) -> None:
+        # 遅延中の設定変更を取りこぼさない
+        _flush()
 
     @commands.Cog.listener()
     async def on_ready(self) -> None:
@@ -1851,6 +2744,12 @@ class FlashAdmin(commands.Cog):
 
         ※ここで copy_global_to / guild sync を行うと、GLOBAL と GUILD の両方に同名コマンドが登録され、二重表示になります。
         """
+        # scrim.db のインデックスはボタン処理ではなくここで作る（失敗していれば再接続時に再試行）
+        try:
+            await asyncio.to_thread(_ensure_scrim_db_index)
+        except Exception:
+            pass
+
         if self._guild_sync_done:
             return
         self._guild_sync_done = True
@@ -1859,13 +2758,22 @@ class FlashAdmin(commands.Cog):
         try:
             tree = getattr(self.bot, "tree", None)
             if tree is not None and getattr(self.bot, "guilds", None):
+                # sync はギルドごとに1往復かかるので、同時実行数を絞って並列に流す
+                sem = asyncio.Semaphore(_GUILD_SYNC_CONCURRENCY)
+
+                async def _sync_guild(g: discord.Guild) -> None:
+                    async with sem:
+                        await tree.sync(guild=g)  # guild 側から削除を反映
+
+                coros = []
                 for g in list(self.bot.guilds):
                     try:
                         tree.clear_commands(guild=g)  # type: ignore[arg-type]
-                        await tree.sync(guild=g)  # guild 側から削除を反映
                     except Exception:
-                        # ギルド単位の削除に失敗しても起動自体は継続する
                         continue
+                    coros.append(_sync_guild(g))
+                # ギルド単位の削除に失敗しても起動自体は継続する
+                await asyncio.gather(*coros, return_exceptions=True)
         except Exception:
             pass
 
@@ -1887,12 +2795,24 @@ class FlashAdmin(commands.Cog):
         embed = _build_admin_embed(interaction.guild)
         await interaction.response.send_message(embed=embed, view=_build_admin_view(interaction.guild))
 
+    @app_commands.command(name="flash_settings_dump", description="設定ファイルを整形して書き出します（確認用）")
+    @app_commands.default_permissions(administrator=True)
+    async def flash_settings_dump(self, interaction: discord.Interaction) -> None:
+        if not _is_admin(interaction):
+            await interaction.response.send_message("この操作は管理者のみ実行できます。", ephemeral=True)
+            return
+        try:
+            path = _write_settings_pretty()
+        except Exception as e:
+            await interaction.response.send_message(f"書き出しに失敗しました: {e}", ephemeral=True)
+            return
+        await interaction.response.send_message(f"整形済みの設定を `{path.name}` に書き出しました。", ephemeral=True)
+
     
 
 async def setup(bot: commands.Bot) -> None:
     _flash_migrate_namespace_once()
     try:
-        import logging
         logging.getLogger("scrim_keydrop_bot").info(f"flash_admin build: {FLASH_ADMIN_BUILD}")
     except Exception:
         pass
@@ -9,12 +9,23 @@ from datetime import datetime, timezone, timedelta
 JST = timezone(timedelta(hours=9))
 from typing import Optional, Dict, Any, List, Tuple
 import json
+import time
+import atexit
+import functools
+import threading
+import random
+from concurrent.futures import ThreadPoolExecutor
 
 import secrets
 import discord
 from discord import app_commands
-import gspread
-from google.oauth2.service_account import Credentials
+
+# orjson があれば保存を高速化（無ければ標準 json）
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None  # type: ignore
+
 from pathlib import Path
 
 def _find_project_root(start: Path) -> Path:
@@ -50,10 +61,15 @@ SHEET_INDEX = 0
 
 
 # =========================
-# Paths & persistence (panel_state.json)
+# Paths & persistence (panel_state.json / runtime_state.json)
 # =========================
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 PANEL_STATE_JSON = str(DATA_DIR / "panel_state.json")
+# 参加者・運営の操作のたびに変わるキーは runtime_state.json に分けて保存する
+# （スレッド作成などで大会設定まで毎回シリアライズしないため）。
+# ※ or40_key_bot は panel_state.json の event_date/start_time を読むので、大会設定は panel 側に残す
+RUNTIME_STATE_JSON = str(DATA_DIR / "runtime_state.json")
+_RUNTIME_KEYS = ("active_threads", "threads", "ops_links", "ops_status", "ops_status_msg", "next_draft_no")
 
 DEFAULT_CONFIG: Dict[str, Any] = {
     "tournament_id": "",
@@ -76,17 +92,27 @@ DEFAULT_CONFIG: Dict[str, Any] = {
 }
 
 
+def _read_json_file(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f) or {}
+
+
 def load_config(base: Dict[str, Any]) -> Dict[str, Any]:
-    """panel_state.json を読み込み、base(DEFAULT_CONFIG相当)にマージして返す。"""
-    if not os.path.exists(PANEL_STATE_JSON):
+    """panel_state.json と runtime_state.json を読み込み、base(DEFAULT_CONFIG相当)にマージして返す。
+
+    runtime_state.json が無い（分割前のデータ）場合は panel_state.json 内の値をそのまま使う。
+    """
+    # 未書き込みの保存があれば先に反映してから読む
+    _flush_config()
+    if not os.path.exists(PANEL_STATE_JSON) and not os.path.exists(RUNTIME_STATE_JSON):
         return dict(base)
 
     try:
-        with open(PANEL_STATE_JSON, "r", encoding="utf-8") as f:
-            data = json.load(f) or {}
-
         merged = dict(base)
-        merged.update(data)
+        merged.update(_read_json_file(PANEL_STATE_JSON))
+        merged.update(_read_json_file(RUNTIME_STATE_JSON))
 
         # 型崩れ対策
         if not isinstance(merged.get("status_toggle"), dict):
@@ -98,12 +124,131 @@ def load_config(base: Dict[str, Any]) -> Dict[str, Any]:
     except Exception:
         return dict(base)
 
+# save_config / save_runtime は短時間の連続呼び出しをまとめて1回だけ書く（ボタン連打時など）
+_SAVE_DELAY = 0.2
+_SAVE_PENDING: Dict[str, Dict[str, Any]] = {}  # 保存先パス -> 次に書く config
+_SAVE_HANDLE: Optional[asyncio.TimerHandle] = None
+_SAVE_TASK: Optional["asyncio.Task[None]"] = None
+# 実際のファイル書き込み（tmp への書き込み〜os.replace）を直列化する。
+# 書き込みは executor のスレッドと、同期の _flush_config（load_config 前・終了時）の両方から来るので
+# asyncio.Lock ではなくスレッドのロックを使う
+_SAVE_LOCK = threading.Lock()
+# シリアライズ済みで書き込み待ちの最新内容（保存先パス -> バイト列）。
+# 取り出しは _SAVE_LOCK を持った書き込み側で行うので、古い内容が新しい内容の後に書かれることはない
+_SAVE_READY: Dict[str, bytes] = {}
+_SAVE_READY_LOCK = threading.Lock()
+
+
+def _dump_config(config: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        # OPT_NON_STR_KEYS: 標準 json と同じく int キーを文字列として書く
+        return orjson.dumps(config, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(config, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _config_part(path: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    """保存先ファイルに書くキーだけを取り出す（浅いコピー）。"""
+    if path == RUNTIME_STATE_JSON:
+        return {k: config[k] for k in _RUNTIME_KEYS if k in config}
+    return {k: v for k, v in config.items() if k not in _RUNTIME_KEYS}
+
+
+def _write_config_bytes(path: str, buf: bytes) -> None:
+    """path（panel_state.json / runtime_state.json）を原子的に置き換える。"""
+    tmp = path + ".tmp"
+    # 1回の write で書き切れるよう大きめのバッファで開く
+    with open(tmp, "wb", buffering=1 << 16) as f:
+        f.write(buf)
+        # 置換前に中身をディスクへ（クラッシュ時に空/途中のファイルにならないように）。
+        # 保存はデバウンスでまとめているので fsync は連打1回分につき1回で済む
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _stage_pending() -> bool:
+    """保留中の保存をシリアライズし、書き込み待ちの最新内容として置く（同じパスの古い内容は置き換える）。"""
+    global _SAVE_PENDING
+    pending, _SAVE_PENDING = _SAVE_PENDING, {}
+    if not pending:
+        return False
+    items = {path: _dump_config(_config_part(path, config)) for path, config in pending.items()}
+    with _SAVE_READY_LOCK:
+        _SAVE_READY.update(items)
+    return True
+
+
+def _write_pending() -> None:
+    """書き込み待ちの最新内容を _SAVE_LOCK の中で取り出して書く。
+
+    runtime_state.json を先に書く（分割前の panel_state.json から runtime のキーを消す前に、
+    移し先が確実にある状態にするため）。
+    """
+    global _SAVE_READY
+    with _SAVE_LOCK:
+        with _SAVE_READY_LOCK:
+            ready, _SAVE_READY = _SAVE_READY, {}
+        for path in (RUNTIME_STATE_JSON, PANEL_STATE_JSON):
+            if path in ready:
+                _write_config_bytes(path, ready[path])
+
+
+def _flush_config() -> None:
+    """保留中の保存があれば、今すぐ（呼び出し元のスレッドで）書く。"""
+    global _SAVE_HANDLE
+    if _SAVE_HANDLE is not None:
+        _SAVE_HANDLE.cancel()
+        _SAVE_HANDLE = None
+    _stage_pending()
+    _write_pending()
+
+
+async def _flush_config_async() -> None:
+    # dict の走査はイベントループ側で済ませ（他のハンドラと同時に触らない）、書き込みだけ別スレッドへ
+    if not _stage_pending():
+        return
+    await asyncio.get_running_loop().run_in_executor(None, _write_pending)
+
+
+def _on_save_timer() -> None:
+    global _SAVE_HANDLE, _SAVE_TASK
+    _SAVE_HANDLE = None
+    if _SAVE_TASK is not None and not _SAVE_TASK.done():
+        # 前回の書き込みがまだ終わっていない。同じ tmp に並行して書かないよう待つ
+        _SAVE_HANDLE = asyncio.get_running_loop().call_later(_SAVE_DELAY, _on_save_timer)
+        return
+    _SAVE_TASK = asyncio.get_running_loop().create_task(_flush_config_async())
+
+
+def _schedule_save(config: Dict[str, Any], paths: Tuple[str, ...]) -> None:
+    global _SAVE_HANDLE
+    for path in paths:
+        _SAVE_PENDING[path] = config
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _flush_config()
+        return
+    if _SAVE_HANDLE is None:
+        _SAVE_HANDLE = loop.call_later(_SAVE_DELAY, _on_save_timer)
+
+
 def save_config(config: Dict[str, Any]) -> None:
-    """panel_state.json に現在のconfigを保存する（原子的に置換）。"""
-    tmp = PANEL_STATE_JSON + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(config, f, ensure_ascii=False, indent=2)
-    os.replace(tmp, PANEL_STATE_JSON)
+    """現在のconfigを panel_state.json / runtime_state.json に保存する（原子的に置換）。
+
+    イベントループ上では少し遅らせて書き、その間の保存要求は1回にまとめる。
+    ループ外（起動前など）ではその場で書く。
+    """
+    _schedule_save(config, (PANEL_STATE_JSON, RUNTIME_STATE_JSON))
+
+
+def save_runtime(config: Dict[str, Any]) -> None:
+    """_RUNTIME_KEYS だけを変更したときの保存。runtime_state.json だけを書く。"""
+    _schedule_save(config, (RUNTIME_STATE_JSON,))
+
+
+# 終了時に保留中の保存を取りこぼさない
+atexit.register(_flush_config)
 
 
 def generate_tournament_id(now: Optional[datetime] = None) -> str:
@@ -116,14 +261,43 @@ def generate_tournament_id(now: Optional[datetime] = None) -> str:
 
 
 # =========================
-# Active thread lock (Discord-only, persisted in panel_state.json)
+# Active thread lock (Discord-only, persisted in runtime_state.json)
 # =========================
-def _active_threads() -> Dict[str, Any]:
-    at = CONFIG.get("active_threads")
-    if not isinstance(at, dict):
-        at = {}
-        CONFIG["active_threads"] = at
-    return at
+# CONFIG 内のサブ dict への参照（_rebind_config_caches で張り直す）。
+# ハンドラのたびに CONFIG.get + isinstance をやり直さないため
+_ACTIVE_THREADS: Dict[str, int] = {}  # str(user_id) -> thread_id（読み込み時に型をそろえる）
+_OPS_LINKS: Dict[str, Any] = {}
+_OPS_STATUS: Dict[str, Any] = {}
+_OPS_STATUS_MSG: Dict[str, Any] = {}
+
+
+def _ensure_sub_dict(key: str) -> Dict[str, Any]:
+    d = CONFIG.get(key)
+    if not isinstance(d, dict):
+        d = {}
+        CONFIG[key] = d
+    return d
+
+
+def _normalize_active_threads(d: Dict[Any, Any]) -> None:
+    """active_threads を {str(user_id): int(thread_id)} にそろえる（その場で書き換え。不正な値は捨てる）。"""
+    norm: Dict[str, int] = {}
+    for k, v in d.items():
+        v = str(v).strip()
+        if v.isdigit() and int(v):
+            norm[str(k)] = int(v)
+    d.clear()
+    d.update(norm)
+
+
+def _rebind_config_caches() -> None:
+    """CONFIG を読み込み直した後に呼ぶ。サブ dict を用意し、モジュール側の参照を張り直す。"""
+    global _ACTIVE_THREADS, _OPS_LINKS, _OPS_STATUS, _OPS_STATUS_MSG
+    _ACTIVE_THREADS = _ensure_sub_dict("active_threads")
+    _normalize_active_threads(_ACTIVE_THREADS)
+    _OPS_LINKS = _ensure_sub_dict("ops_links")
+    _OPS_STATUS = _ensure_sub_dict("ops_status")
+    _OPS_STATUS_MSG = _ensure_sub_dict("ops_status_msg")
 
 
 def get_next_draft_no() -> int:
@@ -131,31 +305,27 @@ def get_next_draft_no() -> int:
     受理Noは受付完了時にスプレッドシート側で採番する。
     """
     try:
-        cfg = load_config(DEFAULT_CONFIG)
-        n = int(cfg.get("next_draft_no") or 1)
+        # 正はメモリ上の CONFIG（起動時に読み込み済み）。毎回ファイルを読み直さない
+        n = int(CONFIG.get("next_draft_no") or 1)
         if n < 1:
             n = 1
-        cfg["next_draft_no"] = n + 1
-        save_config(cfg)
-        # グローバルCONFIGも合わせて更新（稼働中にズレないように）
-        CONFIG["next_draft_no"] = cfg["next_draft_no"]
+        CONFIG["next_draft_no"] = n + 1
+        save_runtime(CONFIG)
         return n
     except Exception:
-        return int(datetime.now().timestamp())
+        # 壁時計の秒（datetime を組み立てない）。monotonic は再起動で巻き戻るので使わない
+        return int(time.time())
 
 def get_active_thread_id_for_user(user_id: int) -> Optional[int]:
-    tid = str(_active_threads().get(str(user_id), "")).strip()
-    return int(tid) if tid.isdigit() else None
+    return _ACTIVE_THREADS.get(str(user_id)) or None
 
 def set_active_thread_for_user(user_id: int, thread_id: int) -> None:
-    _active_threads()[str(user_id)] = int(thread_id)
-    save_config(CONFIG)
+    _ACTIVE_THREADS[str(user_id)] = int(thread_id)
+    save_runtime(CONFIG)
 
 def clear_active_thread_for_user(user_id: int) -> None:
-    at = _active_threads()
-    if str(user_id) in at:
-        at.pop(str(user_id), None)
-        save_config(CONFIG)
+    if _ACTIVE_THREADS.pop(str(user_id), None) is not None:
+        save_runtime(CONFIG)
 # =========================
 # Logging
 # =========================
@@ -204,6 +374,29 @@ OPS_ROLE_ID = 1456621988704424058                       # 運営ロール（動
 ENTRY_ACCEPT_ROLE_ID = int(os.getenv("OR40_ENTRY_ACCEPT_ROLE_ID", "1456603947857875006") or 0)
 ENTRY_ACCEPT_ROLE_NAME = os.getenv("OR40_ENTRY_ACCEPT_ROLE_NAME", "エントリー済")
 
+# guild_id -> (作成した monotonic 時刻, {ロール名(strip済み): Role})
+_ROLE_BY_NAME_CACHE: Dict[int, Tuple[float, Dict[str, discord.Role]]] = {}
+_ROLE_BY_NAME_TTL = 60.0
+
+
+def _role_by_name(guild: discord.Guild, name: str) -> Optional[discord.Role]:
+    now = time.monotonic()
+    hit = _ROLE_BY_NAME_CACHE.get(guild.id)
+    if hit is None or now - hit[0] >= _ROLE_BY_NAME_TTL:
+        by_name: Dict[str, discord.Role] = {}
+        for r in (guild.roles or []):
+            # 同名ロールがあれば従来どおり先頭（position の低い方）を優先
+            by_name.setdefault((r.name or "").strip(), r)
+        hit = (now, by_name)
+        _ROLE_BY_NAME_CACHE[guild.id] = hit
+    r = hit[1].get(name)
+    # TTL 内に削除・改名されていたら作り直して引き直す
+    if r is not None and (guild.get_role(r.id) is None or (r.name or "").strip() != name):
+        _ROLE_BY_NAME_CACHE.pop(guild.id, None)
+        return _role_by_name(guild, name)
+    return r
+
+
 def resolve_entry_accept_role(guild: discord.Guild) -> Optional[discord.Role]:
     if guild is None:
         return None
@@ -219,9 +412,7 @@ def resolve_entry_accept_role(guild: discord.Guild) -> Optional[discord.Role]:
         target = str(ENTRY_ACCEPT_ROLE_NAME or "").strip()
         if not target:
             return None
-        for r in (guild.roles or []):
-            if (r.name or "").strip() == target:
-                return r
+        return _role_by_name(guild, target)
     except Exception:
         pass
     return None
@@ -257,15 +448,26 @@ OPS_STATUS_EMOJI_PRIVATE = {
     OPS_STATUS_DONE: "",  # 完了は無印
 }
 
+# (status, for_forum) -> 絵文字。_apply_status_emoji で1回の辞書引きにする
+_EMOJI_TABLE = {
+    **{(s, True): e for s, e in OPS_STATUS_EMOJI_FORUM.items()},
+    **{(s, False): e for s, e in OPS_STATUS_EMOJI_PRIVATE.items()},
+}
+
+# 先頭のステータス絵文字（連続していてもまとめて）と前後の空白。"⬜️"(異体字セレクタ付き) を "⬜" より先に試す
+_STATUS_EMOJI_RE = re.compile(r"^\s*(?:(?:🟧|⬜️|⬜|🟨|🟪|🟩)\s*)*")
+
+# 参加者からの再連絡（ボタン押下）時のステータス遷移。未知の状態は白から
+_RECONTACT_TRANSITION = {
+    OPS_STATUS_DONE: OPS_STATUS_NEW,  # 完了後の再連絡は白から再スタート
+    OPS_STATUS_INPROGRESS: OPS_STATUS_ADDITIONAL,  # 対応中の追加連絡は紫
+    OPS_STATUS_ADDITIONAL: OPS_STATUS_ADDITIONAL,
+    OPS_STATUS_NEW: OPS_STATUS_NEW,
+}
+
 def _strip_leading_status_emoji(title: str) -> str:
-    t = str(title or "").lstrip()
-    while True:
-        for e in ("🟧", "⬜️", "⬜", "🟨", "🟪", "🟩"):
-            if t.startswith(e):
-                t = t[len(e):].lstrip()
-                break
-        else:
-            return t
+    t = str(title or "")
+    return t[_STATUS_EMOJI_RE.match(t).end():]
 
 
 def _extract_no_prefix_from_thread_title(title: str) -> str:
@@ -279,55 +481,74 @@ def _extract_no_prefix_from_thread_title(title: str) -> str:
 
 def _apply_status_emoji(title: str, status: str, *, for_forum: bool) -> str:
     base = _strip_leading_status_emoji(title)
-    emoji = (OPS_STATUS_EMOJI_FORUM if for_forum else OPS_STATUS_EMOJI_PRIVATE).get(status, "")
+    emoji = _EMOJI_TABLE.get((status, for_forum), "")
     if emoji:
         return f"{emoji} {base}"[:95]
     return base[:95]
 
 def _ops_links() -> dict:
-    d = CONFIG.get("ops_links")
-    if not isinstance(d, dict):
-        d = {}
-        CONFIG["ops_links"] = d
-    return d
+    return _OPS_LINKS
 
 def _ops_status_map() -> dict:
-    d = CONFIG.get("ops_status")
-    if not isinstance(d, dict):
-        d = {}
-        CONFIG["ops_status"] = d
-    return d
+    return _OPS_STATUS
 
 def _ops_status_msg_map() -> dict:
-    d = CONFIG.get("ops_status_msg")
-    if not isinstance(d, dict):
-        d = {}
-        CONFIG["ops_status_msg"] = d
-    return d
+    return _OPS_STATUS_MSG
+
+# thread_id -> (取得した monotonic 時刻, Thread)。fetch_channel で取った（ゲートウェイのキャッシュに無い）
+# スレッドを短時間だけ覚えておき、ステータス更新のたびに REST で取り直さない
+_THREAD_CACHE: Dict[int, Tuple[float, discord.Thread]] = {}
+_THREAD_CACHE_TTL = 300.0
+
+
+async def _resolve_thread(guild: discord.Guild, thread_id: int) -> Optional[Any]:
+    """スレッド（またはチャンネル）を解決する。ゲートウェイのキャッシュ → 短期キャッシュ → REST の順。"""
+    tid = int(thread_id)
+    getter = getattr(guild, "get_channel_or_thread", None) or guild.get_channel
+    ch = getter(tid)
+    if ch is not None:
+        return ch
+
+    now = time.monotonic()
+    hit = _THREAD_CACHE.get(tid)
+    if hit is not None and now - hit[0] < _THREAD_CACHE_TTL:
+        return hit[1]
 
-async def _set_status_forum_and_private(guild: discord.Guild, forum_thread: discord.Thread, private_thread_id: int, status: str):
-    # Update forum title (avoid redundant PATCH)
     try:
+        ch = await guild.fetch_channel(tid)
+    except discord.NotFound:
+        _THREAD_CACHE.pop(tid, None)
+        return None
+    except Exception:
+        return None
+    if isinstance(ch, discord.Thread):
+        _THREAD_CACHE[tid] = (now, ch)
+    return ch
+
+
+def _remember_thread(th: Any) -> None:
+    """edit 後の Thread（名前が新しいもの）で短期キャッシュを差し替える。"""
+    if isinstance(th, discord.Thread) and th.id in _THREAD_CACHE:
+        _THREAD_CACHE[th.id] = (time.monotonic(), th)
+
+
+async def _set_status_forum_and_private(guild: discord.Guild, forum_thread: discord.Thread, private_thread_id: int, status: str):
+    # フォーラム側と参加者スレ側は独立した PATCH なので並行に投げる（どちらかの失敗は他方に影響させない）
+    async def _forum() -> None:
+        # Update forum title (avoid redundant PATCH)
         desired = _apply_status_emoji(forum_thread.name, status, for_forum=True)
         if (forum_thread.name or "") != desired:
-            await forum_thread.edit(name=desired)
-    except Exception:
-        pass
+            _remember_thread(await forum_thread.edit(name=desired))
 
-    # Update private thread title (DONE => remove emoji) (avoid redundant PATCH)
-    try:
-        pth = guild.get_channel(int(private_thread_id)) if private_thread_id else None
-        if pth is None and private_thread_id:
-            try:
-                pth = await guild.fetch_channel(int(private_thread_id))
-            except Exception:
-                pth = None
+    async def _private() -> None:
+        # Update private thread title (DONE => remove emoji) (avoid redundant PATCH)
+        pth = await _resolve_thread(guild, private_thread_id) if private_thread_id else None
         if isinstance(pth, discord.Thread):
             desired_p = _apply_status_emoji(pth.name, status, for_forum=False)
             if (pth.name or "") != desired_p:
-                await pth.edit(name=desired_p)
-    except Exception:
-        pass
+                _remember_thread(await pth.edit(name=desired_p))
+
+    await asyncio.gather(_forum(), _private(), return_exceptions=True)
 
 
 async def _refresh_ops_status_message(guild: discord.Guild, forum_thread: discord.Thread):
@@ -344,7 +565,7 @@ async def _refresh_ops_status_message(guild: discord.Guild, forum_thread: discor
         if msg is None:
             msg = await forum_thread.send("進捗を更新してください。", view=OpsStatusView())
             _ops_status_msg_map()[str(forum_thread.id)] = int(msg.id)
-            save_config(CONFIG)
+            save_runtime(CONFIG)
         else:
             await msg.edit(view=OpsStatusView())
     except Exception:
@@ -406,29 +627,20 @@ async def mark_inquiry_and_notify(thread, st, *, reason_label: str):
                 ftid = st.get("ops_forum_thread_id")
                 forum_thread = None
                 if ftid:
-                    forum_thread = guild.get_channel(int(ftid))
-                    if forum_thread is None:
-                        try:
-                            forum_thread = await guild.fetch_channel(int(ftid))
-                        except Exception:
-                            forum_thread = None
+                    forum_thread = await _resolve_thread(guild, ftid)
 
                 if isinstance(forum_thread, discord.Thread):
                     # 既存に追記して通知を上げる
                     try:
                         # Status transition on re-contact (button press)
-                        cur = _ops_status_map().get(str(forum_thread.id), OPS_STATUS_NEW)
-                        nxt = cur
-                        if cur == OPS_STATUS_DONE:
-                            nxt = OPS_STATUS_NEW  # 完了後の再連絡は白から再スタート
-                        elif cur == OPS_STATUS_INPROGRESS:
-                            nxt = OPS_STATUS_ADDITIONAL  # 対応中の追加連絡は紫
-                        elif cur == OPS_STATUS_ADDITIONAL:
-                            nxt = OPS_STATUS_ADDITIONAL
-                        else:
-                            nxt = OPS_STATUS_NEW
-                        _ops_status_map()[str(forum_thread.id)] = nxt
-                        save_config(CONFIG)
+                        status_map = _ops_status_map()
+                        key = str(forum_thread.id)
+                        cur = status_map.get(key, OPS_STATUS_NEW)
+                        nxt = _RECONTACT_TRANSITION.get(cur, OPS_STATUS_NEW)
+                        # 状態が変わらない再押下では保存しない
+                        if nxt != cur or key not in status_map:
+                            status_map[key] = nxt
+                            save_runtime(CONFIG)
 
                         # Sync titles (forum + private)
                         pvt_id = int(_ops_links().get(str(forum_thread.id), 0) or 0)
@@ -467,7 +679,7 @@ async def mark_inquiry_and_notify(thread, st, *, reason_label: str):
                 try:
                     _ops_links()[str(ft.id)] = int(thread.id)
                     _ops_status_map()[str(ft.id)] = OPS_STATUS_NEW
-                    save_config(CONFIG)
+                    save_runtime(CONFIG)
                 except Exception:
                     pass
 
@@ -520,6 +732,13 @@ async def mark_inquiry_and_notify(thread, st, *, reason_label: str):
         pass
 
 
+# status -> (No の接頭辞, タイトル上の表記)。未知の status は E-No. + status そのまま
+_TITLE_FMT: Dict[str, Tuple[str, str]] = {
+    STATUS_DRAFT: ("P", "記入中"),
+    STATUS_ACCEPTED: ("E", "受付完了"),
+    STATUS_CANCELED: ("E", "キャンセル"),
+}
+
 def format_thread_title(status: str, receipt_no: int, owner_name: str) -> str:
     """
     スレッドタイトル規約（記号なし）:
@@ -530,13 +749,8 @@ def format_thread_title(status: str, receipt_no: int, owner_name: str) -> str:
     """
     owner_name = str(owner_name or "").strip() or "user"
     rn = int(receipt_no or 0)
-    if status == STATUS_DRAFT:
-        return f"P-No.{rn:03d}｜記入中＠{owner_name}"[:95]
-    if status == STATUS_ACCEPTED:
-        return f"E-No.{rn:03d}｜受付完了＠{owner_name}"[:95]
-    if status == STATUS_CANCELED:
-        return f"E-No.{rn:03d}｜キャンセル＠{owner_name}"[:95]
-    return f"E-No.{rn:03d}｜{status}＠{owner_name}"[:95]
+    prefix, label = _TITLE_FMT.get(status) or ("E", status)
+    return f"{prefix}-No.{rn:03d}｜{label}＠{owner_name}"[:95]
 
 REQUIRED_HEADERS = [
     "timestamp(JST)",
@@ -605,6 +819,7 @@ CONFIG: Dict[str, Any] = {
 
 
 CONFIG = load_config(CONFIG)
+_rebind_config_caches()
 # =========================
 # Embed colors
 # =========================
@@ -651,18 +866,24 @@ def is_admin(interaction: discord.Interaction) -> bool:
     return bool(interaction.user.guild_permissions.administrator)
 
 def has_ops_role(member: discord.Member) -> bool:
-    return any(r.id == OPS_ROLE_ID for r in (member.roles or []))
+    # Member.get_role はロールIDの辞書引き（roles を走査しない）
+    return member is not None and member.get_role(OPS_ROLE_ID) is not None
 
 def _weekday_jp(dt: datetime) -> str:
     w = ["月", "火", "水", "木", "金", "土", "日"]
     return w[dt.weekday()]
 
+# 日付 YYYY/M/D・時刻 H:MM（パネル再描画のたびに使うので事前にコンパイル）
+_RE_YMD = re.compile(r"(\d{4})/(\d{1,2})/(\d{1,2})")
+_RE_HM = re.compile(r"\d{1,2}:\d{2}")
+
+@functools.lru_cache(maxsize=64)
 def _fmt_date_ymd_jp(s: str) -> str:
     """
     "2026/2/1" -> "2026/02/01(日)"
     """
     s = (s or "").strip()
-    m = re.fullmatch(r"(\d{4})/(\d{1,2})/(\d{1,2})", s)
+    m = _RE_YMD.fullmatch(s)
     if not m:
         return ""
     y, mo, d = map(int, m.groups())
@@ -671,7 +892,7 @@ def _fmt_date_ymd_jp(s: str) -> str:
 
 def _parse_ymd(s: str) -> datetime:
     s = (s or "").strip()
-    m = re.fullmatch(r"(\d{4})/(\d{1,2})/(\d{1,2})", s)
+    m = _RE_YMD.fullmatch(s)
     if not m:
         raise ValueError(f"日付形式が不正です: {s}")
     y, mo, d = map(int, m.groups())
@@ -688,17 +909,31 @@ def _period_bounds() -> Tuple[datetime, datetime]:
     end = end_d.replace(hour=23, minute=59, second=59)
     return start, end
 
+# (分単位の時刻, period_start, period_end, phase)。境界は 00:00 / 23:59:59 なので分単位で十分
+_PHASE_CACHE: Tuple[int, Any, Any, str] = (-1, None, None, "")
+
 def current_phase() -> str:
     """returns: 'pre' / 'open' / 'post'"""
-    if not (CONFIG.get("period_start") and CONFIG.get("period_end")):
+    global _PHASE_CACHE
+    ps = CONFIG.get("period_start")
+    pe = CONFIG.get("period_end")
+    if not (ps and pe):
         raise ValueError("period not set")
+    minute = int(time.time()) // 60
+    cached = _PHASE_CACHE
+    if cached[0] == minute and cached[1] == ps and cached[2] == pe:
+        return cached[3]
+
     start, end = _period_bounds()
     now = datetime.now(JST)
     if now < start:
-        return "pre"
-    if start <= now <= end:
-        return "open"
-    return "post"
+        ph = "pre"
+    elif start <= now <= end:
+        ph = "open"
+    else:
+        ph = "post"
+    _PHASE_CACHE = (minute, ps, pe, ph)
+    return ph
 
 def accept_status_text() -> str:
     """
@@ -763,7 +998,33 @@ def _period_text() -> str:
         return _fmt_date_ymd_jp(ps)
     return "（未設定）"
 
+# 受付パネルの Embed が参照する CONFIG のキー
+_PANEL_EMBED_KEYS = (
+    "tournament_name", "event_date", "start_time", "mode_people", "mode_type",
+    "matches_count", "capacity", "period_start", "period_end",
+)
+# (参照する設定値 + 受付ステータス, title, description)。同じ内容なら文字列組み立てを省く
+_PANEL_EMBED_CACHE: Optional[Tuple[tuple, str, str]] = None
+
+
 def build_panel_embed() -> discord.Embed:
+    """受付パネルの Embed を返す。
+
+    CONFIG は各所で直接書き換えられるため、版番号ではなく参照する値そのものをキーにする。
+    Embed 自体は送信ごとに別インスタンスにする（使い回さない）。
+    """
+    global _PANEL_EMBED_CACHE
+    key = (tuple(str(CONFIG.get(k, "")) for k in _PANEL_EMBED_KEYS), accept_status_text())
+    cached = _PANEL_EMBED_CACHE
+    if cached is not None and cached[0] == key:
+        return discord.Embed(title=cached[1], description=cached[2], color=COLOR_PANEL)
+
+    embed = _render_panel_embed()
+    _PANEL_EMBED_CACHE = (key, embed.title or "", embed.description or "")
+    return embed
+
+
+def _render_panel_embed() -> discord.Embed:
     title = CONFIG.get("tournament_name") or "（大会名未設定）"
     embed = discord.Embed(title=f"🏆 {title}", color=COLOR_PANEL)
 
@@ -774,7 +1035,7 @@ def build_panel_embed() -> discord.Embed:
     try:
         d = str(CONFIG.get("event_date", "")).strip()
         t = str(CONFIG.get("start_time", "")).strip()
-        if re.fullmatch(r"\d{4}/\d{1,2}/\d{1,2}", d) and re.fullmatch(r"\d{1,2}:\d{2}", t):
+        if _RE_YMD.fullmatch(d) and _RE_HM.fullmatch(t):
             y, mo, da = map(int, d.split("/"))
             hh, mm = map(int, t.split(":"))
             dt0 = datetime(y, mo, da, hh, mm, 0, tzinfo=JST)
@@ -854,16 +1115,190 @@ def indiv_status_summary() -> str:
 # =========================
 # Google Sheets
 # =========================
+@functools.lru_cache(maxsize=None)
+def _gspread():
+    """gspread / google-auth は重いので、初めてシートに触るときに読み込む。"""
+    import gspread
+    from google.oauth2.service_account import Credentials
+    return gspread, Credentials
+
+
+# 認証済みワークシートと見出しのキャッシュ。操作のたびに 認証→open→見出し読み込み をやり直さない。
+# TTL ごとに見出しを読み直すので、運営がシートの列を手で変えても最大 TTL 秒で追従する
+_WS_CACHE_TTL = 300.0
+_WS_CACHE: Dict[str, Any] = {"ws": None, "ts": 0.0, "headers": None, "header_idx": None}
+
+
+def invalidate_worksheet_cache() -> None:
+    _WS_CACHE.update(ws=None, ts=0.0, headers=None, header_idx=None)
+    invalidate_sheet_index()
+
+
+def _invalidate_ws_cache_on_error(e: BaseException) -> None:
+    """認証切れ・権限変更・シート削除（401/403/404）のときだけキャッシュを捨て、次回作り直す。"""
+    resp = getattr(e, "response", None)
+    if getattr(resp, "status_code", None) in (401, 403, 404):
+        invalidate_worksheet_cache()
+
+
+# gspread は同期 API なので、イベントループを止めないよう専用スレッドで実行する。
+# 1本だけにして、gspread のセッションや上のキャッシュ/索引を複数スレッドから同時に触らないようにする
+_SHEETS_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sheets")
+
+
+# Sheets のレート制限（429）はバックオフ＋ジッターで待って再試行する。
+# 待つのはシート用スレッドの中だけで、イベントループは止めない。
+# 429 は「受け付けられなかった」応答なので append を含めて再試行しても二重書き込みにならない
+_SHEET_RETRY_ATTEMPTS = 5
+_SHEET_RETRY_MAX_WAIT = 60.0
+
+
+def _sheet_call(fn, *args, **kwargs):
+    """gspread の呼び出し fn(*args, **kwargs)。429 のときだけ Retry-After（無ければ 2^n 秒）＋ジッターで再試行する。"""
+    for attempt in range(_SHEET_RETRY_ATTEMPTS):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            resp = getattr(e, "response", None)
+            if getattr(resp, "status_code", None) != 429 or attempt == _SHEET_RETRY_ATTEMPTS - 1:
+                raise
+            try:
+                wait = float(resp.headers.get("Retry-After"))
+            except Exception:
+                wait = float(2 ** attempt)
+            time.sleep(min(wait, _SHEET_RETRY_MAX_WAIT) + random.random())
+
+
+async def _sheets(fn, *args, **kwargs):
+    """シート操作 fn(*args, **kwargs) を _SHEETS_EXECUTOR で実行して結果を待つ。"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_SHEETS_EXECUTOR, functools.partial(fn, *args, **kwargs))
+
+
+# 結果を待たなくてよいシート書き込み（キャンセル・受付前修正のステータス/回答反映など）の後書きキュー。
+# 利用者への応答はシートを待たずに返し、短い間に溜まった分は1回のスレッド切り替えでまとめて書く
+_SHEET_WRITE_WINDOW = 0.5
+_SHEET_WRITE_BATCH = 50
+_SHEET_WRITE_Q: Optional["asyncio.Queue[Tuple[Any, Any, tuple]]"] = None
+_SHEET_WRITER_TASK: Optional["asyncio.Task[None]"] = None
+
+
+def _run_sheet_jobs(jobs: List[Tuple[Any, Any, tuple]]) -> None:
+    """シート用スレッドで実行。同じ key の書き込みは最後の1件だけ行う（同じ行への連続更新など）。"""
+    last = {key: i for i, (key, _fn, _args) in enumerate(jobs) if key is not None}
+    for i, (key, fn, args) in enumerate(jobs):
+        if key is not None and last[key] != i:
+            continue
+        try:
+            fn(*args)
+        except Exception as e:
+            _invalidate_ws_cache_on_error(e)
+            run_log(f"sheet write failed: {getattr(fn, '__name__', fn)}: {e}")
+
+
+def queue_sheet_write(key: Any, fn, *args) -> None:
+    """fn(*args) を後書きキューに積む（順序は保つ）。key が同じものは後勝ちでまとめる。"""
+    if _SHEET_WRITER_TASK is None or _SHEET_WRITER_TASK.done():
+        # 書き込み担当が未起動（setup_hook 前など）/ 停止済みなら、ここで起動してから積む
+        start_sheet_writer()
+    _SHEET_WRITE_Q.put_nowait((key, fn, args))
+
+
+async def _sheet_writer() -> None:
+    q = _SHEET_WRITE_Q
+    loop = asyncio.get_running_loop()
+    while True:
+        jobs = [await q.get()]
+        # 取り出した分は必ず task_done する（flush_sheet_writes が q.join() で待つため）
+        try:
+            deadline = loop.time() + _SHEET_WRITE_WINDOW
+            while len(jobs) < _SHEET_WRITE_BATCH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    jobs.append(await asyncio.wait_for(q.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await _sheets(_run_sheet_jobs, jobs)
+            except Exception as e:
+                _invalidate_ws_cache_on_error(e)
+                run_log(f"sheet writer batch failed ({len(jobs)} jobs): {e}")
+        finally:
+            for _ in jobs:
+                q.task_done()
+
+
+def start_sheet_writer() -> None:
+    global _SHEET_WRITE_Q, _SHEET_WRITER_TASK
+    if _SHEET_WRITER_TASK is not None and not _SHEET_WRITER_TASK.done():
+        return
+    # 再起動時は積まれている分を捨てないよう、既存のキューを引き継ぐ
+    if _SHEET_WRITE_Q is None:
+        _SHEET_WRITE_Q = asyncio.Queue()
+    _SHEET_WRITER_TASK = asyncio.get_running_loop().create_task(_sheet_writer())
+
+
+async def flush_sheet_writes() -> None:
+    """終了前に、後書き待ちの書き込みを積んだ順に書き切る。
+
+    書き込み担当がまとめ待ちで抱えているバッチもあるので、キューを横取りせず
+    q.join() で「抱えているバッチ → 残りのキュー」の順に処理し終えるのを待つ。
+    """
+    q = _SHEET_WRITE_Q
+    if q is None:
+        return
+    task = _SHEET_WRITER_TASK
+    if task is not None and not task.done():
+        join = asyncio.ensure_future(q.join())
+        await asyncio.wait({join, task}, return_when=asyncio.FIRST_COMPLETED)
+        if join.done():
+            return
+        join.cancel()
+    # 書き込み担当が止まっている場合は、残りをここで書く
+    jobs = []
+    while not q.empty():
+        jobs.append(q.get_nowait())
+    if not jobs:
+        return
+    try:
+        await _sheets(_run_sheet_jobs, jobs)
+    finally:
+        for _ in jobs:
+            q.task_done()
+
+
 def open_worksheet():
+    ws = _WS_CACHE["ws"]
+    if ws is not None:
+        if time.monotonic() - _WS_CACHE["ts"] < _WS_CACHE_TTL:
+            return ws
+        # TTL 切れ：認証・open はやり直さず、見出しだけ読み直す（手で列を変えられた場合に追従）。
+        # 認証切れ等は _invalidate_ws_cache_on_error でキャッシュごと捨てて作り直す
+        try:
+            ensure_headers(ws)
+        except Exception:
+            invalidate_worksheet_cache()
+            raise
+        _WS_CACHE["ts"] = time.monotonic()
+        return ws
+
+    gspread, Credentials = _gspread()
     scopes = [
         "https://www.googleapis.com/auth/spreadsheets",
         "https://www.googleapis.com/auth/drive",
     ]
     creds = Credentials.from_service_account_file(SERVICE_ACCOUNT_JSON, scopes=scopes)
     gc = gspread.authorize(creds)
-    sh = gc.open_by_key(SPREADSHEET_KEY)
-    ws = sh.get_worksheet(SHEET_INDEX)
-    ensure_headers(ws)
+    sh = _sheet_call(gc.open_by_key, SPREADSHEET_KEY)
+    ws = _sheet_call(sh.get_worksheet, SHEET_INDEX)
+    _WS_CACHE.update(ws=ws, ts=time.monotonic(), headers=None, header_idx=None)
+    try:
+        ensure_headers(ws)
+    except Exception:
+        invalidate_worksheet_cache()
+        raise
     return ws
 
 # =========================
@@ -880,35 +1315,67 @@ HEADER_ALIASES: Dict[str, str] = {
     "C-No": "C-No",
 }
 
+@functools.lru_cache(maxsize=256)
 def _canon_header(h: str) -> str:
+    # 見出しの種類は限られるので結果を覚えておく（strip + 別名解決を毎回やらない）
     h = str(h or "").strip()
     return HEADER_ALIASES.get(h, h)
 
 def _present_canon_headers(headers: List[str]) -> set:
-    return { _canon_header(h) for h in (headers or []) if str(h or "").strip() }
+    return {c for c in map(_canon_header, headers or []) if c}
+
+def _sheet_headers(ws) -> List[str]:
+    """1行目（見出し）。キャッシュ中のワークシートなら読み直さない。"""
+    cached = ws is _WS_CACHE["ws"]
+    if cached and _WS_CACHE["headers"] is not None:
+        return _WS_CACHE["headers"]
+    headers = _sheet_call(ws.row_values, 1)
+    if cached:
+        _WS_CACHE.update(headers=headers, header_idx=None)
+    return headers
 
 def ensure_headers(ws):
-    current = ws.row_values(1)
+    current = _sheet_call(ws.row_values, 1)
     if not current:
-        ws.update("1:1", [REQUIRED_HEADERS])
-        return
-    present = _present_canon_headers(current)
-    missing = [h for h in REQUIRED_HEADERS if _canon_header(h) not in present]
-    if missing:
-        ws.update("1:1", [current + missing])
+        _sheet_call(ws.update, "1:1", [REQUIRED_HEADERS])
+        current = list(REQUIRED_HEADERS)
+    else:
+        present = _present_canon_headers(current)
+        missing = [h for h in REQUIRED_HEADERS if _canon_header(h) not in present]
+        if missing:
+            # 行全体ではなく、足りない列（末尾）だけを書く
+            rowcol_to_a1 = _gspread()[0].utils.rowcol_to_a1
+            start, end = len(current) + 1, len(current) + len(missing)
+            _sheet_call(ws.update, f"{rowcol_to_a1(1, start)}:{rowcol_to_a1(1, end)}", [missing])
+            current = current + missing
+    # 列を足したときも含め、書いた内容で見出しキャッシュを更新（header_index は作り直し）
+    if ws is _WS_CACHE["ws"]:
+        _WS_CACHE.update(headers=current, header_idx=None)
 
 def header_index(ws) -> Dict[str, int]:
-    headers = ws.row_values(1)
+    cached = ws is _WS_CACHE["ws"]
+    if cached and _WS_CACHE["header_idx"] is not None:
+        return _WS_CACHE["header_idx"]
+    idx = _build_header_index(tuple(str(h or "").strip() for h in _sheet_headers(ws)))
+    if cached:
+        _WS_CACHE["header_idx"] = idx
+    return idx  # 1-based
+
+@functools.lru_cache(maxsize=8)
+def _build_header_index(headers: Tuple[str, ...]) -> Dict[str, int]:
+    """strip 済み見出しの並び -> {見出し/正規名: 列番号}。TTL で開き直しても見出しが同じなら作り直さない。
+
+    ※ 返す dict は共有されるので、呼び出し側で書き換えないこと
+    """
     idx: Dict[str, int] = {}
-    for i, h in enumerate(headers, start=1):
-        hs = str(h or '').strip()
+    for i, hs in enumerate(headers, start=1):
         if not hs:
             continue
         idx[hs] = i
         ch = _canon_header(hs)
         if ch and ch not in idx:
             idx[ch] = i
-    return idx  # 1-based
+    return idx
 
 def _now_jst_str() -> str:
     return datetime.now(JST).strftime("%Y/%m/%d %H:%M:%S")
@@ -916,22 +1383,48 @@ def _now_jst_str() -> str:
 def _next_receipt_no(ws) -> int:
     """
     受理No の最大+1（空や非数値は無視）
+
+    最大値は行索引（_sheet_index）が 受理No 列を読むときに一緒に数え、追記のたびに更新している。
+    採番〜追記はシート用スレッド上で続けて行うので、同時の受付完了で同じ番号にはならない
     """
-    idx = header_index(ws)
-    col = idx.get("受理No")
-    if not col:
-        return 1
-    vals = ws.col_values(col)[1:]  # skip header
-    m = 0
-    for v in vals:
-        v = str(v).strip()
-        if v.isdigit():
-            m = max(m, int(v))
-    return m + 1
+    return _sheet_index(ws)["max_rec"] + 1
 
 # =========================
 # Interaction recovery (after bot restart)
 # =========================
+# 裏で動かしている削除タスク（参照を保持しないと完了前に GC される）
+_PURGE_TASKS: set = set()
+
+
+async def _purge_bot_messages(ch: discord.Thread, keep_ids: set, *, before=None, limit: int = 200) -> None:
+    """直近 limit 件のうち keep_ids 以外の BOT 投稿を消す。
+
+    before（リセット時に送ったメッセージ）より前の投稿だけを対象にし、
+    リセット後に投稿された質問UIなどは消さない。
+    purge(bulk=True) なら 100 件ずつ一括削除できる（14日より古いものは discord.py が個別に削除）。
+    一括削除には「メッセージの管理」権限が要るので、無ければ従来どおり1件ずつ消す。
+    """
+    def _check(m: discord.Message) -> bool:
+        return getattr(m.author, "bot", False) and int(m.id) not in keep_ids
+
+    try:
+        await ch.purge(limit=limit, check=_check, before=before, bulk=True, oldest_first=False)
+        return
+    except discord.Forbidden:
+        pass
+    except Exception:
+        return
+
+    try:
+        async for msg in ch.history(limit=limit, before=before, oldest_first=False):
+            try:
+                if _check(msg):
+                    await msg.delete()
+            except Exception:
+                pass
+    except Exception:
+        pass
+
 async def ensure_thread_state(interaction: discord.Interaction) -> Optional[Dict[str, Any]]:
     """Recover THREAD_STATE for persistent button interactions.
 
@@ -960,9 +1453,10 @@ async def ensure_thread_state(interaction: discord.Interaction) -> Optional[Dict
 # Attempt to restore from sheet by threadID (accepted/canceled only)
         restored = None
         try:
-            ws = open_worksheet()
-            restored = find_entry_by_thread_id(ws, int(ch.id))
-        except Exception:
+            ws = await _sheets(open_worksheet)
+            restored = await _sheets(find_entry_by_thread_id, ws, int(ch.id))
+        except Exception as e:
+            _invalidate_ws_cache_on_error(e)
             restored = None
 
         if restored and str(restored.get("status") or "").strip():
@@ -1041,6 +1535,7 @@ async def ensure_thread_state(interaction: discord.Interaction) -> Optional[Dict
 
             # ③ そのあとで古いBOT投稿（質問UIなど）を削除（新規の2投稿は残す）
             keep_ids = set()
+            before = restart_msg
             try:
                 if restart_msg:
                     keep_ids.add(int(restart_msg.id))
@@ -1050,20 +1545,16 @@ async def ensure_thread_state(interaction: discord.Interaction) -> Optional[Dict
                 intro_id = THREAD_STATE.get(ch.id, {}).get("intro_msg_id")
                 if intro_id:
                     keep_ids.add(int(intro_id))
+                    if before is None:
+                        before = discord.Object(id=int(intro_id))
             except Exception:
                 pass
 
-            try:
-                async for msg in ch.history(limit=200, oldest_first=False):
-                    try:
-                        if int(msg.id) in keep_ids:
-                            continue
-                        if getattr(msg.author, "bot", False):
-                            await msg.delete()
-                    except Exception:
-                        pass
-            except Exception:
-                pass
+            # 削除は応答を待たせないよう裏で行う（リセット時の投稿より前だけを対象にする）
+            if before is not None:
+                task = asyncio.create_task(_purge_bot_messages(ch, keep_ids, before=before))
+                _PURGE_TASKS.add(task)
+                task.add_done_callback(_PURGE_TASKS.discard)
 
             return THREAD_STATE.get(ch.id)
 
@@ -1108,8 +1599,101 @@ async def ensure_thread_state(interaction: discord.Interaction) -> Optional[Dict
     except Exception:
         return THREAD_STATE.get(interaction.channel_id)
 
+def _cell(row: List[Any], col: Optional[int]) -> str:
+    """row_values の結果から 1-based 列の値を取る（末尾の空セルは返ってこないので範囲外は空）。"""
+    if not col or col > len(row):
+        return ""
+    return str(row[col - 1]).strip()
+
+def _col_range(col: int) -> str:
+    """1-based 列番号 -> "C:C" 形式の列範囲。"""
+    letter = _gspread()[0].utils.rowcol_to_a1(1, col)[:-1]
+    return f"{letter}:{letter}"
+
+def _digits(v: str) -> str:
+    """数字だけの値を正規化（"0123" -> "123"）。それ以外は空文字。
+
+    isdigit() は "①" や "²" も真になるが int() できないので、isdecimal() で判定する。
+    """
+    return str(int(v)) if v.isdecimal() else ""
+
+# =========================
+# Sheet row index (threadID / DiscordID_1 / 受理No -> 行番号)
+# =========================
+# 検索のたびに列を取り直さないよう、3列を1回の batchGet で読んで行番号を覚えておく。
+# 追記時はその場で更新する。運営が手で行を消す・並べ替える場合に備え、
+# ヒットした行は中身で照合して食い違えば作り直し、TTL を過ぎたら読み直す（見つからない判定もこれで追従）
+_SHEET_INDEX_TTL = 300.0
+_SHEET_INDEX: Dict[str, Any] = {"ts": 0.0, "tid": {}, "did": {}, "key": {}, "max_rec": 0}
+_RE_UPDATED_ROW = re.compile(r"![A-Z]+(\d+)")
+
+
+def invalidate_sheet_index() -> None:
+    _SHEET_INDEX.update(ts=0.0, tid={}, did={}, key={}, max_rec=0)
+
+
+def _index_put(r_i: int, tid: str, did: str, rec: str) -> None:
+    # 同じ値が複数行にある場合は、従来の先頭からの走査と同じく上の行を優先
+    if tid:
+        _SHEET_INDEX["tid"].setdefault(tid, r_i)
+    if rec and int(rec) > _SHEET_INDEX["max_rec"]:
+        _SHEET_INDEX["max_rec"] = int(rec)
+    if did:
+        _SHEET_INDEX["did"].setdefault(did, r_i)
+        if rec:
+            _SHEET_INDEX["key"].setdefault((did, rec), r_i)
+
+
+def _sheet_index(ws) -> Dict[str, Any]:
+    if _SHEET_INDEX["ts"] and time.monotonic() - _SHEET_INDEX["ts"] < _SHEET_INDEX_TTL:
+        return _SHEET_INDEX
+    idx = header_index(ws)
+    cols = [idx.get("threadID"), idx.get("DiscordID_1"), idx.get("受理No")]
+    ranges = [_col_range(c) for c in cols if c]
+    got = iter(_sheet_call(ws.batch_get, ranges) if ranges else [])
+    columns = [next(got) if c else [] for c in cols]
+
+    invalidate_sheet_index()
+    for r_i in range(2, max(len(c) for c in columns) + 1):
+        tid, did, rec = (_digits(_cell(c[r_i - 1], 1)) if r_i <= len(c) else "" for c in columns)
+        _index_put(r_i, tid, did, rec)
+    _SHEET_INDEX["ts"] = time.monotonic()
+    return _SHEET_INDEX
+
+
+def _indexed_row(ws, kind: str, key: Any, verify) -> Optional[Tuple[int, List[Any]]]:
+    """索引から行を引き、その行だけを読んで verify(row) で照合する。(行番号, 行の値) を返す。"""
+    for retry in (False, True):
+        if retry:
+            # 行がずれている（手動での削除・並べ替えなど）。作り直して引き直す
+            invalidate_sheet_index()
+        r_i = _sheet_index(ws)[kind].get(key)
+        if r_i is None:
+            return None
+        row = _sheet_call(ws.row_values, r_i)
+        if verify(row):
+            return r_i, row
+    return None
+
+
+def _index_appended(resp: Any, thread_id: Any, discord_id: Any, receipt_no: Any) -> None:
+    """append_row の応答（updates.updatedRange）から追記行を索引に足す。"""
+    if not _SHEET_INDEX["ts"]:
+        return  # まだ作っていない（次の検索で読み込む）
+    try:
+        m = _RE_UPDATED_ROW.search(str(resp["updates"]["updatedRange"]))
+    except Exception:
+        m = None
+    if not m:
+        invalidate_sheet_index()
+        return
+    _index_put(int(m.group(1)), _digits(str(thread_id)), _digits(str(discord_id)), _digits(str(receipt_no)))
+
 def find_entry_by_thread_id(ws, thread_id: int) -> Optional[Dict[str, Any]]:
-    """Scan sheet and return entry dict for the given thread_id (accepted/canceled rows)."""
+    """Return entry dict for the given thread_id (accepted/canceled rows).
+
+    行番号は索引（_sheet_index）から引き、その行だけを読む。
+    """
     idx = header_index(ws)
     col_thread = idx.get("threadID")
     if not col_thread:
@@ -1129,41 +1713,35 @@ def find_entry_by_thread_id(ws, thread_id: int) -> Optional[Dict[str, Any]]:
     col_custom = idx.get("カスタム権限")
     col_ikigomi = idx.get("意気込みメッセージ")
 
-    vals = ws.get_all_values()
     tid_s = str(int(thread_id))
-    for r_i in range(2, len(vals) + 1):
-        row = vals[r_i - 1]
-        try:
-            if str(row[col_thread - 1]).strip() != tid_s:
-                continue
-        except Exception:
-            continue
-
-        status = str(row[col_status - 1]).strip() if col_status else ""
-        receipt_no = str(row[col_receipt - 1]).strip() if col_receipt else ""
-        owner_id = str(row[col_did - 1]).strip() if col_did else ""
-        owner_name = str(row[col_name - 1]).strip() if col_name else ""
-
-        answers = {
-            "platform": str(row[col_platform - 1]).strip() if col_platform else "",
-            "epic": str(row[col_epic - 1]).strip() if col_epic else "",
-            "callname": str(row[col_callname - 1]).strip() if col_callname else "",
-            "xid": str(row[col_xid - 1]).strip() if col_xid else "",
-            "xurl": str(row[col_xurl - 1]).strip() if col_xurl else "",
-            "custom": str(row[col_custom - 1]).strip() if col_custom else "",
-            "ikigomi": str(row[col_ikigomi - 1]).strip() if col_ikigomi else "",
-        }
-
-        return {
-            "sheet_row": r_i,
-            "status": status,
-            "receipt_no": int(receipt_no) if str(receipt_no).isdigit() else 0,
-            "owner_id": int(owner_id) if str(owner_id).isdigit() else 0,
-            "owner_name": owner_name,
-            "answers": answers,
-        }
-
-    return None
+    hit = _indexed_row(ws, "tid", tid_s, lambda row: _digits(_cell(row, col_thread)) == tid_s)
+    if hit is None:
+        return None
+    r_i, row = hit
+
+    status = _cell(row, col_status)
+    receipt_no = _cell(row, col_receipt)
+    owner_id = _cell(row, col_did)
+    owner_name = _cell(row, col_name)
+
+    answers = {
+        "platform": _cell(row, col_platform),
+        "epic": _cell(row, col_epic),
+        "callname": _cell(row, col_callname),
+        "xid": _cell(row, col_xid),
+        "xurl": _cell(row, col_xurl),
+        "custom": _cell(row, col_custom),
+        "ikigomi": _cell(row, col_ikigomi),
+    }
+
+    return {
+        "sheet_row": r_i,
+        "status": status,
+        "receipt_no": int(receipt_no) if str(receipt_no).isdigit() else 0,
+        "owner_id": int(owner_id) if str(owner_id).isdigit() else 0,
+        "owner_name": owner_name,
+        "answers": answers,
+    }
 
 def find_existing_thread_for_user(ws, discord_id_1: int) -> Optional[Tuple[int, str, int, int]]:
     """
@@ -1177,25 +1755,35 @@ def find_existing_thread_for_user(ws, discord_id_1: int) -> Optional[Tuple[int,
     if not all([col_id, col_status, col_thread, col_receipt]):
         return None
 
-    vals = ws.get_all_values()
-    for r_i in range(2, len(vals) + 1):
-        row = vals[r_i - 1]
-        try:
-            did = str(row[col_id - 1]).strip()
-            if did and int(did) == int(discord_id_1):
-                status = str(row[col_status - 1]).strip()
-                thread_id_s = str(row[col_thread - 1]).strip()
-                receipt_s = str(row[col_receipt - 1]).strip()
-                thread_id = int(thread_id_s) if thread_id_s.isdigit() else 0
-                receipt_no = int(receipt_s) if receipt_s.isdigit() else 0
-                return (r_i, status, thread_id, receipt_no)
-        except Exception:
-            continue
-    return None
+    # 索引で行を特定し、その行だけを読む
+    uid_s = str(int(discord_id_1))
+    hit = _indexed_row(ws, "did", uid_s, lambda row: _digits(_cell(row, col_id)) == uid_s)
+    if hit is None:
+        return None
+    r_i, row = hit
+    status = _cell(row, col_status)
+    thread_id_s = _cell(row, col_thread)
+    receipt_s = _cell(row, col_receipt)
+    thread_id = int(thread_id_s) if thread_id_s.isdigit() else 0
+    receipt_no = int(receipt_s) if receipt_s.isdigit() else 0
+    return (r_i, status, thread_id, receipt_no)
+
+def _open_and_find_existing(discord_id_1: int) -> Tuple[Any, Optional[Tuple[int, str, int, int]]]:
+    """シートを開き、既存エントリーを探す（シート用スレッドで1回で済ませる）。
+
+    開けなければ例外。検索の失敗は「既存なし」(None) として扱う。
+    """
+    ws = open_worksheet()
+    try:
+        row_info = find_existing_thread_for_user(ws, discord_id_1)
+    except Exception as e:
+        _invalidate_ws_cache_on_error(e)
+        row_info = None
+    return ws, row_info
 
 def create_draft_row(ws, receipt_no: int, discord_id_1: int, discord_name: str, thread_id):
     idx = header_index(ws)
-    row = [""] * len(ws.row_values(1))
+    row = [""] * len(_sheet_headers(ws))
 
     def setv(key: str, val: str):
         c = idx.get(key)
@@ -1211,41 +1799,57 @@ def create_draft_row(ws, receipt_no: int, discord_id_1: int, discord_name: str,
     setv("Discord名_1", discord_name)
     setv("threadID", str(thread_id))
     setv("質問項目(ONのみ)", "")
-    ws.append_row(row, value_input_option="RAW")
+    resp = _sheet_call(ws.append_row, row, value_input_option="RAW")
+    _index_appended(resp, thread_id, discord_id_1, receipt_no)
+
+# 回答キー -> シートの列見出し（UI表記）。追記・更新の両方でこの並びを使う
+_ANSWER_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("platform", "機種"),
+    ("epic", "EPIC ID"),
+    ("callname", "呼び名"),
+    ("xid", "XのID"),
+    ("xurl", "XのURL"),
+    ("custom", "カスタム権限"),
+    ("ikigomi", "意気込みメッセージ"),
+)
+
+def _answer_cells(answers: Dict[str, Any], *, present_only: bool) -> List[Tuple[str, str]]:
+    """回答を (列見出し, 値) の並びにする（末尾に 質問項目(ONのみ)）。
+
+    present_only=True なら answers にあるキーだけ（既存行の部分更新用）。
+    """
+    cells = [(header, str(answers.get(key, ""))) for key, header in _ANSWER_FIELDS
+             if not present_only or key in answers]
+    on_list = [k for k in CONFIG.get("indiv_order") or [] if str(answers.get(k, "")).strip()]
+    cells.append(("質問項目(ONのみ)", ",".join(on_list)))
+    return cells
 
 def update_row_answers(ws, row_num: int, answers: Dict[str, Any], status: str):
     idx = header_index(ws)
+    # セルごとに update_cell すると項目数ぶん往復するので、集めて1回の batch_update で書く
+    cells: Dict[int, str] = {}
 
     def upd(key: str, val: str):
         c = idx.get(key)
         if c:
-            ws.update_cell(row_num, c, val)
+            cells[c] = val
 
     upd("timestamp(JST)", _now_jst_str())
     upd("status", status)
 
-    # answers mapping
-    if "platform" in answers:
-        upd("機種", str(answers.get("platform", "")))
-    if "epic" in answers:
-        upd("EPIC ID", str(answers.get("epic", "")))
-    if "callname" in answers:
-        upd("呼び名", str(answers.get("callname", "")))
-    if "xid" in answers:
-        upd("XのID", str(answers.get("xid", "")))
-    if "xurl" in answers:
-        upd("XのURL", str(answers.get("xurl", "")))
-    if "custom" in answers:
-        upd("カスタム権限", str(answers.get("custom", "")))
-    if "ikigomi" in answers:
-        upd("意気込みメッセージ", str(answers.get("ikigomi", "")))
-
-    # ON only list
-    on_list = []
-    for k in CONFIG.get("indiv_order") or []:
-        if k in answers and str(answers.get(k, "")).strip():
-            on_list.append(k)
-    upd("質問項目(ONのみ)", ",".join(on_list))
+    # answers mapping（answers にある項目だけ）+ ON only list
+    for header, val in _answer_cells(answers, present_only=True):
+        upd(header, val)
+
+    if not cells:
+        return
+    rowcol_to_a1 = _gspread()[0].utils.rowcol_to_a1
+    # update_cell と同じく USER_ENTERED（timestamp などの解釈を従来どおりにする）
+    _sheet_call(
+        ws.batch_update,
+        [{"range": rowcol_to_a1(row_num, c), "values": [[v]]} for c, v in cells.items()],
+        value_input_option="USER_ENTERED",
+    )
 
 
 def _to_int(v: Any) -> int:
@@ -1264,19 +1868,17 @@ def _find_row_by_receipt_and_user(ws, receipt_no: int, discord_id_1: int) -> Opt
     if not col_id or not col_receipt:
         return None
 
-    vals = ws.get_all_values()
-    for r_i in range(2, len(vals) + 1):
-        row = vals[r_i - 1]
-        did = str(row[col_id - 1]).strip()
-        rec = str(row[col_receipt - 1]).strip()
-        if did.isdigit() and rec.isdigit() and int(did) == int(discord_id_1) and int(rec) == int(receipt_no):
-            return r_i
-    return None
+    key = (str(int(discord_id_1)), str(int(receipt_no)))
+    hit = _indexed_row(
+        ws, "key", key,
+        lambda row: (_digits(_cell(row, col_id)), _digits(_cell(row, col_receipt))) == key,
+    )
+    return hit[0] if hit else None
 
 def append_final_row(ws, receipt_no: int, discord_id_1: int, discord_name: str, thread_id: int, answers: Dict[str, Any]):
     """受付完了時にだけ append する（ドラフトは作らない）"""
     idx = header_index(ws)
-    headers = ws.row_values(1)
+    headers = _sheet_headers(ws)
     row = [""] * len(headers)
 
     def setv(key: str, val: str):
@@ -1293,21 +1895,11 @@ def append_final_row(ws, receipt_no: int, discord_id_1: int, discord_name: str,
     setv("threadID", str(thread_id))
     setv("抽選ポイント(空欄OK)", "")
 
-    setv("機種", str(answers.get("platform", "")))
-    setv("EPIC ID", str(answers.get("epic", "")))
-    setv("呼び名", str(answers.get("callname", "")))
-    setv("XのID", str(answers.get("xid", "")))
-    setv("XのURL", str(answers.get("xurl", "")))
-    setv("カスタム権限", str(answers.get("custom", "")))
-    setv("意気込みメッセージ", str(answers.get("ikigomi", "")))
-
-    on_list = []
-    for k in CONFIG.get("indiv_order") or []:
-        if str(answers.get(k, "")).strip():
-            on_list.append(k)
-    setv("質問項目(ONのみ)", ",".join(on_list))
+    for header, val in _answer_cells(answers, present_only=False):
+        setv(header, val)
 
-    ws.append_row(row, value_input_option="RAW")
+    resp = _sheet_call(ws.append_row, row, value_input_option="RAW")
+    _index_appended(resp, thread_id, discord_id_1, receipt_no)
 
 # =========================
 # Channel name control
@@ -1402,9 +1994,12 @@ class EntryPanelView(discord.ui.View):
         interaction: discord.Interaction,
         button: discord.ui.Button
     ):
+        # 何より先に ACK（後続のシート/Discord API が遅くても 3 秒の期限に間に合わせる）。以降の返答は followup
+        await silent_ack(interaction, ephemeral=True)
+
         # 受付チャンネル制限
         if interaction.channel_id != ENTRY_CHANNEL_ID:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "受付チャンネルから操作してください。",
                 ephemeral=True
             )
@@ -1413,23 +2008,19 @@ class EntryPanelView(discord.ui.View):
         # フェーズ判定
         member = interaction.user
         if not isinstance(member, discord.Member):
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "権限判定に失敗しました。",
                 ephemeral=True
             )
             return
 
         if not entry_button_enabled_for(member):
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "現在この操作はできません。",
                 ephemeral=True
             )
             return
 
-        # followup を使うので先に ACK（タイムアウト防止）
-        # 既に ensure_thread_state 内で ACK 済みの場合があるため、二重応答を避ける
-        await silent_ack(interaction, ephemeral=True)
-
         # 重複発行防止：一度作成した個スレを再利用する（threadタイトルはダミーなので使わない）
         try:
             threads_map = CONFIG.setdefault("threads", {})
@@ -1459,24 +2050,31 @@ class EntryPanelView(discord.ui.View):
                 # 参照不能ならマップを掃除して作り直しを許可
                 try:
                     threads_map.pop(str(interaction.user.id), None)
-                    save_config(CONFIG)
+                    save_runtime(CONFIG)
                 except Exception:
                     pass
 
 
+        # スレッド作成先の解決と、シート（開く＋既存エントリー検索）は互いに独立なので並行に行う
+        async def _resolve_parent():
+            ch = interaction.client.get_channel(THREAD_PARENT_CHANNEL_ID)
+            if ch is None:
+                ch = await interaction.client.fetch_channel(THREAD_PARENT_CHANNEL_ID)
+            return ch
+
+        parent, sheet = await asyncio.gather(
+            _resolve_parent(),
+            _sheets(_open_and_find_existing, interaction.user.id),
+            return_exceptions=True,
+        )
+
         # スレッド作成
-        parent = interaction.client.get_channel(THREAD_PARENT_CHANNEL_ID)
-        if parent is None:
-            try:
-                parent = await interaction.client.fetch_channel(
-                    THREAD_PARENT_CHANNEL_ID
-                )
-            except Exception:
-                await interaction.followup.send(
-                    "スレッド作成先チャンネルが見つかりません。",
-                    ephemeral=True
-                )
-                return
+        if isinstance(parent, BaseException):
+            await interaction.followup.send(
+                "スレッド作成先チャンネルが見つかりません。",
+                ephemeral=True
+            )
+            return
 
         if not isinstance(parent, discord.TextChannel):
             await interaction.followup.send(
@@ -1486,11 +2084,10 @@ class EntryPanelView(discord.ui.View):
             return
 
         # シートを開く（採番・転記に使用）
-        try:
-            ws = open_worksheet()
-        except Exception as e:
+        if isinstance(sheet, BaseException):
+            _invalidate_ws_cache_on_error(sheet)
             await interaction.followup.send(
-                f"シート参照エラー：{e}",
+                f"シート参照エラー：{sheet}",
                 ephemeral=True
             )
             return
@@ -1499,10 +2096,7 @@ class EntryPanelView(discord.ui.View):
         #  - 記入中(またはロック中): 既存スレッドへ誘導（新規生成しない）
         #  - 受付完了: 受理済み案内
         #  - キャンセル: 再エントリー可（= 既存なし扱い）
-        try:
-            row_info = find_existing_thread_for_user(ws, interaction.user.id)
-        except Exception:
-            row_info = None
+        ws, row_info = sheet
 
         if row_info:
             _row, _status, _thread_id, _receipt = row_info
@@ -1585,7 +2179,7 @@ class EntryPanelView(discord.ui.View):
         # 永続マップ：user_id -> thread_id
         try:
             CONFIG.setdefault("threads", {})[str(interaction.user.id)] = int(thread.id)
-            save_config(CONFIG)
+            save_runtime(CONFIG)
         except Exception:
             pass
 
@@ -1619,18 +2213,20 @@ class ThreadEntryLoopView(discord.ui.View):
 
     @discord.ui.button(label="エントリーを開始する", style=discord.ButtonStyle.success, custom_id="thread:toggle_entry", row=0)
     async def toggle_entry(self, interaction: discord.Interaction, button: discord.ui.Button):
+        # 状態復元（シート参照あり）より先に ACK する。エフェメラルで確認を出したいので ephemeral で defer
+        await silent_ack(interaction, ephemeral=True)
         st = await ensure_thread_state(interaction)
         if not st:
             return
         if interaction.user.id != st.get("owner_id"):
-            await interaction.response.send_message("この操作は本人のみ実行できます。", ephemeral=True)
+            await interaction.followup.send("この操作は本人のみ実行できます。", ephemeral=True)
             return
 
         # 受付中以外は進めない（動作確認中は運営だけOK）
         member = interaction.user
         if isinstance(member, discord.Member):
             if not entry_button_enabled_for(member):
-                await interaction.response.send_message("現在この操作はできません。", ephemeral=True)
+                await interaction.followup.send("現在この操作はできません。", ephemeral=True)
                 return
 
         thread = interaction.channel
@@ -1639,9 +2235,7 @@ class ThreadEntryLoopView(discord.ui.View):
 
         # 「開始」→開始／「クリア」→初期化、を1ボタンでループ
         if not st.get("in_entry"):
-            # 開始：初期化してから質問へ
-            # エフェメラルで確認を出したいので、最初のACKもephemeralでdeferする
-            await interaction.response.defer(thinking=False, ephemeral=True)
+            # 開始：初期化してから質問へ（ACK は冒頭で済んでいる）
             await reset_entry_flow(thread, st, to_initial=False)
             st["in_edit"] = False
             st["edit_from_index"] = None
@@ -1669,8 +2263,6 @@ class ThreadEntryLoopView(discord.ui.View):
             return
 
         # クリア：状態を初期化して導入状態へ戻す
-        # 既に ensure_thread_state 内で ACK 済みの場合があるため、二重応答を避ける
-        await silent_ack(interaction, ephemeral=True)
         await reset_entry_flow(thread, st, to_initial=True)
 
         st["in_entry"] = False
@@ -1755,7 +2347,7 @@ class OpsStatusView(discord.ui.View):
 
         # Update status
         _ops_status_map()[str(forum_thread.id)] = OPS_STATUS_INPROGRESS
-        save_config(CONFIG)
+        save_runtime(CONFIG)
 
         # Sync titles (forum + private)
         guild = interaction.guild
@@ -1804,7 +2396,7 @@ class OpsStatusView(discord.ui.View):
             return
 
         _ops_status_map()[str(forum_thread.id)] = OPS_STATUS_DONE
-        save_config(CONFIG)
+        save_runtime(CONFIG)
 
         guild = interaction.guild
         if guild:
@@ -2593,29 +3185,30 @@ class ConfirmView(discord.ui.View):
 
         # シート転記
         try:
-            ws = open_worksheet()
             row = st.get("sheet_row")
-            if row:
-                update_row_answers(ws, int(row), st.get("answers", {}), STATUS_ACCEPTED)
-            else:
+            answers = st.get("answers", {})
+            owner_id = int(st.get("owner_id", 0))
+            owner_name = str(st.get("owner_name", ""))
+
+            def _write_accepted() -> Optional[Tuple[int, Optional[int]]]:
+                # 採番→追記→行特定はシート用スレッド上で続けて行う（同時の受付完了で同じ受理Noを振らない）
+                ws = open_worksheet()
+                if row:
+                    update_row_answers(ws, int(row), answers, STATUS_ACCEPTED)
+                    return None
                 # 受理Noは「受付完了時」にスプレッドシート側で採番する
                 try:
-                    accepted_no = _next_receipt_no(ws)
+                    accepted_no = int(_next_receipt_no(ws))
                 except Exception:
                     accepted_no = int(datetime.now().timestamp())
-                st["receipt_no"] = int(accepted_no)
-
-                append_final_row(
-                    ws,
-                    int(st.get("receipt_no", 0)),
-                    int(st.get("owner_id", 0)),
-                    str(st.get("owner_name", "")),
-                    int(thread.id),
-                    st.get("answers", {}),
-                )
-                r2 = _find_row_by_receipt_and_user(ws, int(st.get("receipt_no", 0)), int(st.get("owner_id", 0)))
-                st["sheet_row"] = r2
+                append_final_row(ws, accepted_no, owner_id, owner_name, int(thread.id), answers)
+                return accepted_no, _find_row_by_receipt_and_user(ws, accepted_no, owner_id)
+
+            written = await _sheets(_write_accepted)
+            if written is not None:
+                st["receipt_no"], st["sheet_row"] = written
         except Exception as e:
+            _invalidate_ws_cache_on_error(e)
             try:
                 await thread.send(f"シート更新エラー：{e}")
             except Exception:
@@ -3315,15 +3908,16 @@ async def perform_cancel_entry(thread: discord.Thread, st: Dict[str, Any]):
 
     # シート status 更新
     try:
-        ws = open_worksheet()
+        ws = await _sheets(open_worksheet)
         row = st.get("sheet_row")
         if not row:
-            row = _find_row_by_receipt_and_user(ws, receipt_no, user_id)
+            row = await _sheets(_find_row_by_receipt_and_user, ws, receipt_no, user_id)
             st["sheet_row"] = row
         if row:
-            update_row_answers(ws, int(row), st.get("answers", {}), STATUS_CANCELED)
-    except Exception:
-        pass
+            # ステータス反映は待たずに後書き（回答は今の内容で固定して渡す）
+            queue_sheet_write(("row", int(row)), update_row_answers, ws, int(row), dict(st.get("answers", {})), STATUS_CANCELED)
+    except Exception as e:
+        _invalidate_ws_cache_on_error(e)
 
     st["status"] = STATUS_CANCELED
 
@@ -3397,19 +3991,24 @@ class EditConfirmView(discord.ui.View):
                 pass
 
             try:
-                ws = open_worksheet()
+                ws = await _sheets(open_worksheet)
                 row = st.get("sheet_row")
                 if not row:
-                    row = _find_row_by_receipt_and_user(
+                    row = await _sheets(
+                        _find_row_by_receipt_and_user,
                         ws,
                         int(st.get("receipt_no", 0) or 0),
                         int(st.get("owner_id", 0) or 0),
                     )
                     st["sheet_row"] = row
                 if row:
-                    update_row_answers(ws, int(row), st.get("answers", {}), st.get("status", STATUS_PRE_ENTRY))
-            except Exception:
-                pass
+                    # 反映は待たずに後書き（回答は今の内容で固定して渡す）
+                    queue_sheet_write(
+                        ("row", int(row)),
+                        update_row_answers, ws, int(row), dict(st.get("answers", {})), st.get("status", STATUS_PRE_ENTRY),
+                    )
+            except Exception as e:
+                _invalidate_ws_cache_on_error(e)
 
             try:
                 await post_confirm(thread)
@@ -3901,10 +4500,10 @@ class EventDateModal(discord.ui.Modal):
         d = str(self.event_date.value).strip()
         t = str(self.start_time.value).strip()
 
-        if not re.fullmatch(r"\d{4}/\d{1,2}/\d{1,2}", d):
+        if not _RE_YMD.fullmatch(d):
             await interaction.response.send_message("⚠️ 開催日の形式が不正です。YYYY/M/D", ephemeral=True)
             return
-        if not re.fullmatch(r"\d{1,2}:\d{2}", t):
+        if not _RE_HM.fullmatch(t):
             await interaction.response.send_message("⚠️ 開始時間の形式が不正です。HH:MM", ephemeral=True)
             return
 
@@ -4387,7 +4986,7 @@ class EntryThreadHelperView(discord.ui.View):
 
         uid = interaction.user.id
 
-        # Prefer panel_state.json active_threads mapping
+        # Prefer persisted active_threads mapping (runtime_state.json)
         tid = None
         try:
             tid = get_active_thread_id_for_user(uid)
@@ -4484,6 +5083,15 @@ class AdminOR40Bot(discord.Client):
         except Exception:
             pass
         await self.tree.sync()
+        start_sheet_writer()
+
+    async def close(self):
+        # 後書き待ちのシート書き込みを取りこぼさない
+        try:
+            await flush_sheet_writes()
+        except Exception:
+            pass
+        await super().close()
 
     async def on_ready(self):
         run_log(f"Logged in as {self.user}")
@@ -4493,6 +5101,7 @@ class AdminOR40Bot(discord.Client):
             # reload persisted config (in case file changed while offline)
             global CONFIG
             CONFIG = load_config(CONFIG)
+            _rebind_config_caches()
         except Exception:
             pass
 
@@ -5130,7 +5739,7 @@ class EntryCleanupConfirmView(discord.ui.View):
 
         # clear active_threads first to prevent deadlocks even if deletion errors
         try:
-            CONFIG["active_threads"] = {}
+            _ACTIVE_THREADS.clear()
             CONFIG["threads"] = {}
             CONFIG["next_draft_no"] = 1
             save_config(CONFIG)
@@ -5193,7 +5802,7 @@ async def entry_cleanup(interaction: discord.Interaction):
     if not targets:
         # 削除対象がなくても「番号リセット（フルリセット）」は可能にする
         try:
-            CONFIG["active_threads"] = {}
+            _ACTIVE_THREADS.clear()
             CONFIG["threads"] = {}
             CONFIG["next_draft_no"] = 1
             save_config(CONFIG)